@@ -4,12 +4,18 @@ import os
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-from util.logger import get_logger
+# Add paths for importing config and util modules
+_SRC_DIR = str(Path(__file__).resolve().parents[2] / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+_LIB_DIR = str(Path(__file__).resolve().parent)
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 
-# Import config
-from . import config
+# Import config as the same top-level module the other libraries use, so
+# it is loaded (and config.ini parsed) only once per process
+import config
+from util.logger import get_logger
 
 
 class BaseTest:
@@ -21,6 +27,8 @@ class BaseTest:
         """Initialize base test class."""
         self.logger = None
         self.test_name = None
+        # Snapshot config settings once so lookups are plain dict reads
+        self._config_values = {k: v for k, v in vars(config).items() if k.isupper() and not k.startswith('_')}
     
     def setup_test_logging(self, test_name, log_dir=None):
         """Setup logging for a test.
@@ -91,4 +99,4 @@ class BaseTest:
         Returns:
             Configuration value
         """
-        return getattr(config, key, None)
+        return self._config_values.get(key)
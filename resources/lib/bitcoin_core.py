@@ -1,18 +1,193 @@
 """Bitcoin Core node management for Robot Framework tests."""
 
+import http.client
+import json
 import os
-import subprocess
+import shutil
+import signal
 import sys
 import time
 from pathlib import Path
 
 # Add paths for importing config and util modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-sys.path.insert(0, os.path.dirname(__file__))
+_SRC_DIR = str(Path(__file__).resolve().parents[2] / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+_LIB_DIR = str(Path(__file__).resolve().parent)
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 
 # Import config and logging
 import config
 from util.logger import get_logger
+from util.rpc import BitcoinRPC
+from util.util import is_process_running, read_pid_file, tail_lines, wait_for_process
+
+# Shared by all BitcoinCore instances so re-instantiating the library does
+# not rebuild the logger's handlers
+_LOGGER = get_logger('bitcoin_core')
+
+# GPG status keywords that decide the outcome of a signature verification
+_GPG_STATUS_KEYWORDS = frozenset({"GOODSIG", "VALIDSIG", "NO_PUBKEY"})
+
+# HTTP redirect statuses followed by downloads, and how many in a row
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 5
+
+# Positions of the arguments bitcoin-cli sends as JSON rather than as strings,
+# per method, following bitcoin-cli's vRPCConvertParams table. Methods whose
+# arguments are all strings map to an empty set. Command strings for methods
+# missing here are rejected when they have arguments, since their types are
+# unknown; pass those as a list with typed parameters instead.
+_CLI_JSON_PARAMS = {
+    # Blockchain
+    "getblock": {1},
+    "getblockfilter": set(),
+    "getblockhash": {0},
+    "getblockheader": {1},
+    "getblockstats": {0, 1},
+    "getchaintxstats": {0},
+    "getdeploymentinfo": set(),
+    "getmempoolancestors": {1},
+    "getmempooldescendants": {1},
+    "getmempoolentry": set(),
+    "getrawmempool": {0, 1},
+    "gettxout": {1, 2},
+    "gettxoutproof": {0},
+    "gettxoutsetinfo": {1, 2},
+    "invalidateblock": set(),
+    "preciousblock": set(),
+    "pruneblockchain": {0},
+    "reconsiderblock": set(),
+    "scantxoutset": {1},
+    "verifychain": {0, 1},
+    "waitforblock": {1},
+    "waitforblockheight": {0, 1},
+    "waitfornewblock": {0},
+    # Control
+    "help": set(),
+    "logging": {0, 1},
+    "stop": {0},
+    # Mining and generating
+    "generateblock": {1, 2},
+    "generatetoaddress": {0, 2},
+    "generatetodescriptor": {0, 2},
+    "getblocktemplate": {0},
+    "getnetworkhashps": {0, 1},
+    "prioritisetransaction": {1, 2},
+    "submitblock": set(),
+    # Network
+    "addnode": set(),
+    "disconnectnode": {1},
+    "getaddednodeinfo": set(),
+    "getnodeaddresses": {0},
+    "setban": {2, 3},
+    "setnetworkactive": {0},
+    "setmocktime": {0},
+    # Raw transactions and PSBTs
+    "analyzepsbt": set(),
+    "combinepsbt": {0},
+    "combinerawtransaction": {0},
+    "converttopsbt": {1, 2},
+    "createpsbt": {0, 1, 2, 3},
+    "createrawtransaction": {0, 1, 2, 3},
+    "decodepsbt": set(),
+    "decoderawtransaction": {1},
+    "decodescript": set(),
+    "finalizepsbt": {1},
+    "fundrawtransaction": {1, 2},
+    "getrawtransaction": {1},
+    "joinpsbts": {0},
+    "sendrawtransaction": {1, 2},
+    "signrawtransactionwithkey": {1, 2},
+    "submitpackage": {0},
+    "testmempoolaccept": {0, 1},
+    "utxoupdatepsbt": {1},
+    # Utilities
+    "createmultisig": {0, 1},
+    "deriveaddresses": {1},
+    "estimatesmartfee": {0},
+    "getdescriptorinfo": set(),
+    "validateaddress": set(),
+    "verifymessage": set(),
+    # Wallet
+    "abandontransaction": set(),
+    "backupwallet": set(),
+    "bumpfee": {1},
+    "createwallet": {1, 2, 4, 5, 6, 7},
+    "dumpprivkey": set(),
+    "encryptwallet": set(),
+    "getaddressinfo": set(),
+    "getbalance": {1, 2, 3},
+    "getnewaddress": set(),
+    "getrawchangeaddress": set(),
+    "getreceivedbyaddress": {1, 2},
+    "getreceivedbylabel": {1, 2},
+    "gettransaction": {1, 2},
+    "importdescriptors": {0},
+    "keypoolrefill": {0},
+    "listdescriptors": {0},
+    "listreceivedbyaddress": {0, 1, 2, 4},
+    "listreceivedbylabel": {0, 1, 2, 3},
+    "listsinceblock": {1, 2, 3, 4},
+    "listtransactions": {1, 2, 3},
+    "listunspent": {0, 1, 2, 3, 4},
+    "loadwallet": {1},
+    "lockunspent": {0, 1, 2},
+    "psbtbumpfee": {1},
+    "rescanblockchain": {0, 1},
+    "restorewallet": {2},
+    "send": {0, 1, 3, 4},
+    "sendall": {0, 1, 3, 4},
+    "sendmany": {1, 2, 4, 5, 6, 8, 9},
+    "sendtoaddress": {1, 4, 5, 6, 8, 9, 10},
+    "setlabel": set(),
+    "settxfee": {0},
+    "setwalletflag": {1},
+    "signmessage": set(),
+    "unloadwallet": {1},
+    "walletcreatefundedpsbt": {0, 1, 2, 3, 4},
+    "walletpassphrase": {1},
+    "walletprocesspsbt": {1, 3, 4},
+}
+
+
+def _parse_cli_args(method, args):
+    """Convert bitcoin-cli style string arguments to JSON-RPC parameters.
+    
+    Arguments at the positions bitcoin-cli converts for the method are
+    parsed as JSON and all others are sent as strings, so labels or wallet
+    names such as "123" or "true" keep their type.
+    
+    Args:
+        method: RPC method name
+        args: Argument strings
+        
+    Returns:
+        List of parameters
+        
+    Raises:
+        RuntimeError: If the method takes arguments of unknown types
+    """
+    if not args:
+        return []
+    
+    json_params = _CLI_JSON_PARAMS.get(method)
+    if json_params is None:
+        raise RuntimeError(
+            f"Argument types of {method} are unknown; pass the command as a list with typed parameters"
+        )
+    
+    params = []
+    for i, arg in enumerate(args):
+        if i in json_params:
+            try:
+                params.append(json.loads(arg))
+                continue
+            except ValueError:
+                pass
+        params.append(arg)
+    return params
 
 
 class BitcoinCore:
@@ -28,15 +203,19 @@ class BitcoinCore:
         """
         self.bitcoin_version = bitcoin_version or config.BITCOIN_VERSION
         self.bitcoin_dir = f"bitcoin-{self.bitcoin_version}"
-        self.bitcoind = f"{self.bitcoin_dir}/bin/bitcoind"
-        self.bitcoin_cli = f"{self.bitcoin_dir}/bin/bitcoin-cli"
-        self.logger = get_logger('bitcoin_core')
+        self._bin_dir = Path(self.bitcoin_dir, "bin")
+        self.bitcoind = str(self._bin_dir / "bitcoind")
+        self.logger = _LOGGER
+        self._rpc_clients = {}
+        self._download_timeout = config.BITCOIN_DOWNLOAD_TIMEOUT
+        self._node_start_timeout = config.NODE_START_TIMEOUT
 
     def download_bitcoin_core(self, version=None):
         """Download and extract Bitcoin Core release with integrity verification.
         
-        Downloads the Bitcoin Core tarball, SHA256SUMS, and SHA256SUMS.asc files,
-        then verifies the checksum and signature before extraction.
+        Downloads the Bitcoin Core tarball, SHA256SUMS, and SHA256SUMS.asc files
+        over persistent HTTPS connections, then verifies the checksum and
+        signature before extraction.
         
         Note: GPG signature verification requires Bitcoin Core builder keys to be
         imported into the GPG keyring. Keys can be found at:
@@ -45,6 +224,10 @@ class BitcoinCore:
         Args:
             version: Version to download (uses default if not specified)
         """
+        # Only needed when downloading, which most test runs skip
+        import tarfile
+        from concurrent.futures import ThreadPoolExecutor
+        
         if version is None:
             version = self.bitcoin_version
         
@@ -54,101 +237,107 @@ class BitcoinCore:
         sha256sums_url = f"{base_url}/SHA256SUMS"
         sha256sums_asc_url = f"{base_url}/SHA256SUMS.asc"
         
-        timeout = config.BITCOIN_DOWNLOAD_TIMEOUT
-        
-        # Download the tarball
-        self.logger.info(f"Downloading Bitcoin Core {version}")
-        result = subprocess.run(
-            ["wget", "--timeout", str(timeout), tarball_url],
-            capture_output=True,
-            text=True
-        )
+        timeout = self._download_timeout
         
-        if result.returncode != 0:
-            # Check if it's a timeout error (wget exit code 4)
-            if result.returncode == 4:
-                self.logger.error(
-                    f"Download timeout after {timeout} seconds. "
-                    f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
-                )
-                raise RuntimeError(
-                    f"Download timeout after {timeout} seconds. "
-                    f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
-                )
-            self.logger.error(f"Failed to download Bitcoin Core: {result.stderr}")
-            raise RuntimeError(f"Failed to download Bitcoin Core: {result.stderr}")
+        # Download the tarball on its own connection while the two small
+        # signature files share a second keep-alive connection
+        self.logger.info(f"Downloading Bitcoin Core {version}, SHA256SUMS and SHA256SUMS.asc")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self._download_files, [tarball_url], timeout),
+                executor.submit(self._download_files, [sha256sums_url, sha256sums_asc_url], timeout),
+            ]
+            digests = {}
+            for future in futures:
+                digests.update(future.result())
         
         if not os.path.exists(tarball):
             raise RuntimeError(f"Download file {tarball} not found")
         
-        # Download SHA256SUMS
-        self.logger.info("Downloading SHA256SUMS")
-        result = subprocess.run(
-            ["wget", "--timeout", str(timeout), sha256sums_url],
-            capture_output=True,
-            text=True
-        )
+        # Verify GPG signature
+        self.logger.info("Verifying GPG signature of SHA256SUMS")
+        self._verify_gpg_signature("SHA256SUMS.asc", "SHA256SUMS")
+        self.logger.info("GPG signature verification successful")
         
-        if result.returncode != 0:
-            if result.returncode == 4:
-                self.logger.error(
-                    f"Download timeout after {timeout} seconds. "
-                    f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
-                )
-                raise RuntimeError(
-                    f"Download timeout after {timeout} seconds. "
-                    f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
-                )
-            self.logger.error(f"Failed to download SHA256SUMS: {result.stderr}")
-            raise RuntimeError(f"Failed to download SHA256SUMS: {result.stderr}")
-        
-        # Download SHA256SUMS.asc
-        self.logger.info("Downloading SHA256SUMS.asc")
-        result = subprocess.run(
-            ["wget", "--timeout", str(timeout), sha256sums_asc_url],
-            capture_output=True,
-            text=True
-        )
+        # Verify SHA256 checksum of the tarball against its SHA256SUMS entry
+        self.logger.info("Verifying SHA256 checksum")
+        expected_hash = self._find_expected_sha256("SHA256SUMS", tarball)
         
-        if result.returncode != 0:
-            if result.returncode == 4:
-                self.logger.error(
-                    f"Download timeout after {timeout} seconds. "
-                    f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
-                )
-                raise RuntimeError(
-                    f"Download timeout after {timeout} seconds. "
-                    f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
-                )
-            self.logger.error(f"Failed to download SHA256SUMS.asc: {result.stderr}")
-            raise RuntimeError(f"Failed to download SHA256SUMS.asc: {result.stderr}")
+        if expected_hash is None:
+            self.logger.error(f"Tarball {tarball} checksum verification failed")
+            raise RuntimeError(f"Tarball {tarball} not verified in SHA256SUMS")
+        
+        # The tarball was hashed while it was downloaded, so it is only read
+        # from disk once, for extraction
+        if digests[tarball] != expected_hash:
+            self.logger.error(f"SHA256 checksum verification failed for {tarball}")
+            raise RuntimeError(f"SHA256 checksum verification failed for {tarball}")
+        
+        self.logger.info("SHA256 checksum verification successful")
+        
+        # Extract the tarball
+        self.logger.info("Extracting Bitcoin Core")
+        try:
+            with tarfile.open(tarball, "r:gz") as tf:
+                if hasattr(tarfile, "data_filter"):
+                    tf.extractall(filter="data")
+                else:
+                    tf.extractall()
+        except (OSError, tarfile.TarError) as e:
+            self.logger.error(f"Failed to extract Bitcoin Core: {e}")
+            raise RuntimeError(f"Failed to extract Bitcoin Core: {e}")
+        
+        if not os.path.exists(self.bitcoin_dir):
+            raise RuntimeError(f"Bitcoin directory {self.bitcoin_dir} not found after extraction")
+
+    def _find_expected_sha256(self, sums_file, filename):
+        """Find the expected SHA256 digest of a file in a SHA256SUMS file.
+        
+        Args:
+            sums_file: Path to the SHA256SUMS file
+            filename: Name of the file to look up
+            
+        Returns:
+            Hex digest listed for the file, or None if it is not listed
+        """
+        with open(sums_file, 'r') as f:
+            for line in f:
+                # Lines are '<digest>  <name>', '*<name>' in binary mode
+                if filename in line:
+                    digest, _, name = line.strip().partition(" ")
+                    if name.strip().lstrip("*") == filename:
+                        return digest
+        return None
+
+    def _verify_gpg_signature(self, signature_file, signed_file):
+        """Verify a detached GPG signature.
+        
+        Args:
+            signature_file: Path to the detached signature
+            signed_file: Path to the signed file
+            
+        Raises:
+            RuntimeError: If the signing key is missing or the signature is invalid
+        """
+        import subprocess
         
-        # Verify GPG signature
-        self.logger.info("Verifying GPG signature of SHA256SUMS")
         result = subprocess.run(
-            ["gpg", "--status-fd", "1", "--verify", "SHA256SUMS.asc", "SHA256SUMS"],
+            ["gpg", "--status-fd", "1", "--verify", signature_file, signed_file],
             capture_output=True,
             text=True
         )
         
-        # Parse GPG status output for reliable verification
-        # --status-fd outputs machine-readable status lines
-        has_good_signature = False
-        has_valid_signature = False
-        missing_key = False
-        
+        # --status-fd outputs machine-readable '[GNUPG:] <KEYWORD> <args>' lines
+        status = {}
         for line in result.stdout.splitlines():
-            if line.startswith("[GNUPG:] GOODSIG"):
-                has_good_signature = True
-            elif line.startswith("[GNUPG:] VALIDSIG"):
-                has_valid_signature = True
-            elif line.startswith("[GNUPG:] NO_PUBKEY"):
-                missing_key = True
+            parts = line.split(None, 2)
+            if len(parts) >= 2 and parts[0] == "[GNUPG:]" and parts[1] in _GPG_STATUS_KEYWORDS:
+                status.setdefault(parts[1], parts[2] if len(parts) > 2 else "")
         
         # Check for missing key first
-        if missing_key:
+        if "NO_PUBKEY" in status:
             self.logger.warning(
-                "GPG signature verification failed: builder keys not imported. "
+                f"GPG signature verification failed: builder key {status['NO_PUBKEY']} not imported. "
                 "Import keys from https://github.com/bitcoin-core/guix.sigs/tree/main/builder-keys"
             )
             self.logger.warning(f"GPG output: {result.stderr}")
@@ -158,48 +347,82 @@ class BitcoinCore:
             )
         
         # Check for signature verification failure
-        if result.returncode != 0 or not (has_good_signature and has_valid_signature):
+        if result.returncode != 0 or not ("GOODSIG" in status and "VALIDSIG" in status):
             self.logger.error(f"GPG signature verification failed: {result.stderr}")
             raise RuntimeError(f"GPG signature verification failed: {result.stderr}")
         
-        self.logger.info("GPG signature verification successful")
-        
-        # Verify SHA256 checksum
-        self.logger.info("Verifying SHA256 checksum")
-        result = subprocess.run(
-            ["sha256sum", "--check", "--ignore-missing", "SHA256SUMS"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            self.logger.error(f"SHA256 checksum verification failed: {result.stderr}")
-            raise RuntimeError(f"SHA256 checksum verification failed: {result.stderr}")
-        
-        # Check that the specific tarball was verified successfully
-        # sha256sum output format is: '<filename>: OK'
-        tarball_verified = False
-        for line in result.stdout.splitlines():
-            if line == f"{tarball}: OK":
-                tarball_verified = True
-                break
-        
-        if not tarball_verified:
-            self.logger.error(f"Tarball {tarball} checksum verification failed")
-            raise RuntimeError(f"Tarball {tarball} not verified in SHA256SUMS")
-        
-        self.logger.info("SHA256 checksum verification successful")
+        self.logger.debug(f"Good signature from {status['GOODSIG']}")
+
+    def _download_files(self, urls, timeout):
+        """Download files over keep-alive HTTPS connections.
         
-        # Extract the tarball
-        self.logger.info("Extracting Bitcoin Core")
-        result = subprocess.run(["tar", "-xzf", tarball], capture_output=True, text=True)
+        Each file is saved in the current directory under the last path
+        component of its URL and hashed as it is written. Redirects to other
+        HTTPS URLs are followed like wget does; requests to a host already
+        connected to reuse its connection.
         
-        if result.returncode != 0:
-            self.logger.error(f"Failed to extract Bitcoin Core: {result.stderr}")
-            raise RuntimeError(f"Failed to extract Bitcoin Core: {result.stderr}")
+        Args:
+            urls: URLs to download, usually all served by the same host
+            timeout: Socket timeout in seconds
+            
+        Returns:
+            Dictionary mapping each saved file name to its SHA256 hex digest
+        """
+        import hashlib
+        from urllib.parse import urljoin, urlsplit
         
-        if not os.path.exists(self.bitcoin_dir):
-            raise RuntimeError(f"Bitcoin directory {self.bitcoin_dir} not found after extraction")
+        digests = {}
+        conns = {}
+        try:
+            for url in urls:
+                filename = os.path.basename(urlsplit(url).path)
+                try:
+                    target = url
+                    for _ in range(_MAX_REDIRECTS + 1):
+                        parts = urlsplit(target)
+                        if parts.scheme != "https":
+                            raise RuntimeError(f"Refusing to download from non-HTTPS URL {target}")
+                        conn = conns.get(parts.netloc)
+                        if conn is None:
+                            conn = conns[parts.netloc] = http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+                        conn.request("GET", f"{parts.path}?{parts.query}" if parts.query else parts.path)
+                        response = conn.getresponse()
+                        if response.status not in _REDIRECT_STATUSES:
+                            break
+                        location = response.getheader("Location")
+                        response.read()
+                        if not location:
+                            raise RuntimeError(f"HTTP {response.status} {response.reason} without a Location")
+                        target = urljoin(target, location)
+                    else:
+                        raise RuntimeError(f"More than {_MAX_REDIRECTS} redirects")
+                    
+                    if response.status != 200:
+                        response.read()
+                        raise RuntimeError(f"HTTP {response.status} {response.reason}")
+                    sha256 = hashlib.sha256()
+                    with open(filename, "wb") as f:
+                        while chunk := response.read(1 << 20):
+                            sha256.update(chunk)
+                            f.write(chunk)
+                    digests[filename] = sha256.hexdigest()
+                except TimeoutError:
+                    self.logger.error(
+                        f"Download timeout after {timeout} seconds. "
+                        f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
+                    )
+                    raise RuntimeError(
+                        f"Download timeout after {timeout} seconds. "
+                        f"Adjust BITCOIN_DOWNLOAD_TIMEOUT in config.ini if needed."
+                    )
+                except (OSError, http.client.HTTPException, RuntimeError) as e:
+                    self.logger.error(f"Failed to download {filename}: {e}")
+                    raise RuntimeError(f"Failed to download {filename}: {e}")
+        finally:
+            for conn in conns.values():
+                conn.close()
+        
+        return digests
 
     def start_bitcoin_node(self, datadir, port, rpcport=None, connect=None, daemon=True):
         """Start a Bitcoin node in regtest mode.
@@ -211,6 +434,8 @@ class BitcoinCore:
             connect: Address to connect to (optional)
             daemon: Run as daemon (default: True)
         """
+        import subprocess
+        
         self.logger.info(f"Starting Bitcoin node with datadir={datadir}, port={port}")
         
         cmd = [self.bitcoind, "-regtest", f"-datadir={datadir}", f"-port={port}", "-bind=127.0.0.1"]
@@ -222,13 +447,17 @@ class BitcoinCore:
         if daemon:
             cmd.append("-daemon")
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         
         if result.returncode != 0:
             self.logger.error(f"Failed to start Bitcoin node: {result.stderr}")
             raise RuntimeError(f"Failed to start Bitcoin node: {result.stderr}")
         
-        time.sleep(2)  # Wait for node to start
+        pid_file = os.path.join(datadir, "regtest", "bitcoind.pid")
+        if daemon and not wait_for_process(pid_file, self._node_start_timeout):
+            self.logger.error(f"Bitcoin node did not start within {self._node_start_timeout} seconds")
+            raise RuntimeError(f"Bitcoin node did not start within {self._node_start_timeout} seconds")
+        
         self.logger.debug(f"Bitcoin node started successfully")
 
     def stop_bitcoin_node(self, datadir):
@@ -238,40 +467,76 @@ class BitcoinCore:
             datadir: Data directory of the node to stop
         """
         print(f"Stopping Bitcoin node with datadir={datadir}")
-        pid_file = Path(datadir) / "regtest" / "bitcoind.pid"
+        pid_file = os.path.join(datadir, "regtest", "bitcoind.pid")
         
-        if pid_file.exists():
-            subprocess.run(["pkill", "-F", str(pid_file)], capture_output=True)
+        pid = read_pid_file(pid_file)
+        if pid is not None:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass  # Node already exited
+        
+        # Drop kept-alive RPC connections to the stopped node
+        for key in [key for key in self._rpc_clients if key[0] == datadir]:
+            self._rpc_clients.pop(key).close()
         
         time.sleep(1)  # Wait for node to stop
 
     def execute_bitcoin_cli(self, datadir, command, rpcport=None, rpcwallet=None):
-        """Execute bitcoin-cli command.
+        """Execute a bitcoin-cli style command over JSON-RPC.
+        
+        For a command string, arguments are converted like bitcoin-cli does:
+        those at the method's JSON positions (amounts, counts, flags, arrays,
+        objects) are sent as JSON, everything else as a string. Only methods
+        in _CLI_JSON_PARAMS can be given arguments this way, and arguments
+        cannot contain spaces. A pre-tokenized command list is sent as-is, so
+        its parameters must already have their JSON types; use it for any
+        other method.
         
         Args:
             datadir: Data directory
-            command: Command string to execute
+            command: Command string, or list of method name and parameters
             rpcport: RPC port (optional)
             rpcwallet: Wallet name (optional)
             
         Returns:
-            Command output as string
+            Command output as string, formatted like bitcoin-cli
+            
+        Raises:
+            RuntimeError: If the call fails, or a command string has arguments
+                for a method not in _CLI_JSON_PARAMS
         """
-        cmd = [self.bitcoin_cli, "-regtest", f"-datadir={datadir}"]
-        
-        if rpcport:
-            cmd.append(f"-rpcport={rpcport}")
-        if rpcwallet:
-            cmd.append(f"-rpcwallet={rpcwallet}")
-        
-        cmd.extend(command.split())
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"CLI command failed: {result.stderr}")
+        if isinstance(command, str):
+            method, *args = command.split()
+            params = _parse_cli_args(method, args)
+        else:
+            method, *params = command
+        
+        result = self._rpc_call(datadir, method, params, rpcport=rpcport, wallet=rpcwallet)
+        
+        if result is None:
+            return ""
+        if isinstance(result, str):
+            return result
+        return json.dumps(result, indent=2)
+
+    def _rpc_call(self, datadir, method, params=None, rpcport=None, wallet=None):
+        """Execute an RPC call on a node over its persistent connection.
         
-        return result.stdout.strip()
+        Args:
+            datadir: Data directory
+            method: RPC method name
+            params: List of positional parameters (optional)
+            rpcport: RPC port (optional)
+            wallet: Wallet name (optional)
+            
+        Returns:
+            The RPC result
+        """
+        key = (datadir, rpcport)
+        if key not in self._rpc_clients:
+            self._rpc_clients[key] = BitcoinRPC(datadir, rpcport, host=config.DEFAULT_BIND_ADDRESS)
+        return self._rpc_clients[key].call(method, params, wallet=wallet)
 
     def get_block_count(self, datadir, rpcport=None):
         """Get the current block count.
@@ -284,7 +549,7 @@ class BitcoinCore:
             Block count as integer
         """
         output = self.execute_bitcoin_cli(datadir, "getblockcount", rpcport=rpcport)
-        return int(output.strip())
+        return int(output)
 
     def create_wallet(self, datadir, wallet_name, rpcport=None):
         """Create a wallet.
@@ -294,7 +559,7 @@ class BitcoinCore:
             wallet_name: Name of wallet to create
             rpcport: RPC port (optional)
         """
-        output = self.execute_bitcoin_cli(datadir, f"createwallet {wallet_name}", rpcport=rpcport)
+        output = self.execute_bitcoin_cli(datadir, ["createwallet", wallet_name], rpcport=rpcport)
         print(f"Wallet created: {output}")
 
     def generate_blocks(self, datadir, wallet_name, count, rpcport=None):
@@ -306,32 +571,40 @@ class BitcoinCore:
             count: Number of blocks to generate
             rpcport: RPC port (optional)
         """
-        address = self.execute_bitcoin_cli(
-            datadir, "getnewaddress", rpcport=rpcport, rpcwallet=wallet_name
-        )
-        
-        output = self.execute_bitcoin_cli(
-            datadir, 
-            f"generatetoaddress {count} {address.strip()}", 
-            rpcport=rpcport, 
-            rpcwallet=wallet_name
+        # Both calls reuse the node's keep-alive connection; they cannot be
+        # batched since generatetoaddress needs the new address
+        address = self._rpc_call(datadir, "getnewaddress", rpcport=rpcport, wallet=wallet_name)
+        self._rpc_call(
+            datadir,
+            "generatetoaddress",
+            [int(count), address],
+            rpcport=rpcport,
+            wallet=wallet_name
         )
         print(f"Generated {count} blocks")
 
-    def wait_for_node_to_start(self, datadir, rpcport=None, timeout=30):
+    def wait_for_node_to_start(self, datadir, rpcport=None, timeout=None):
         """Wait for node to be responsive.
         
         Args:
             datadir: Data directory
             rpcport: RPC port (optional)
-            timeout: Timeout in seconds (default: 30)
+            timeout: Timeout in seconds (default: NODE_START_TIMEOUT from config)
         """
-        for i in range(timeout):
+        if timeout is None:
+            timeout = self._node_start_timeout
+        
+        # Poll with exponential backoff (capped at 1s) so a fast start is
+        # detected quickly without hammering a slow one
+        deadline = time.monotonic() + float(timeout)
+        delay = 0.05
+        while time.monotonic() < deadline:
             try:
                 self.execute_bitcoin_cli(datadir, "getblockchaininfo", rpcport=rpcport)
                 return  # Success
             except RuntimeError:
-                time.sleep(1)
+                time.sleep(min(delay, max(0, deadline - time.monotonic())))
+                delay = min(delay * 2, 1.0)
         
         raise RuntimeError(f"Node did not start within {timeout} seconds")
 
@@ -342,10 +615,13 @@ class BitcoinCore:
             datadir: Directory to clean
         """
         print(f"Cleaning directory {datadir}")
-        import shutil
         
-        if os.path.exists(datadir):
+        # rmtree already walks the tree with os.scandir, so just skip the
+        # separate existence probe
+        try:
             shutil.rmtree(datadir)
+        except FileNotFoundError:
+            pass
         os.makedirs(datadir, exist_ok=True)
 
     def get_debug_log_path(self, datadir):
@@ -357,7 +633,7 @@ class BitcoinCore:
         Returns:
             Path to debug.log
         """
-        return str(Path(datadir) / "regtest" / "debug.log")
+        return os.path.join(datadir, "regtest", "debug.log")
 
     def monitor_debug_log(self, datadir, lines=50):
         """Get the last N lines from debug.log.
@@ -369,18 +645,12 @@ class BitcoinCore:
         Returns:
             Last N lines of debug.log as string
         """
-        log_path = Path(datadir) / "regtest" / "debug.log"
+        log_path = os.path.join(datadir, "regtest", "debug.log")
         
-        if not log_path.exists():
+        if not os.path.exists(log_path):
             return "Debug log not found"
         
-        result = subprocess.run(
-            ["tail", "-n", str(lines), str(log_path)],
-            capture_output=True,
-            text=True
-        )
-        
-        return result.stdout
+        return tail_lines(log_path, int(lines))
 
     def check_node_is_running(self, datadir):
         """Check if a node is running.
@@ -391,17 +661,6 @@ class BitcoinCore:
         Returns:
             True if node is running, False otherwise
         """
-        pid_file = Path(datadir) / "regtest" / "bitcoind.pid"
+        pid_file = os.path.join(datadir, "regtest", "bitcoind.pid")
         
-        if not pid_file.exists():
-            return False
-        
-        try:
-            with open(pid_file, 'r') as f:
-                pid = int(f.read().strip())
-            
-            # Check if process exists
-            os.kill(pid, 0)
-            return True
-        except (OSError, ValueError):
-            return False
+        return is_process_running(pid_file)
@@ -1,37 +1,52 @@
 """Centralized configuration for Bitcoin Core tests."""
 
 import configparser
+import hashlib
+import json
 import os
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def _get_config_path():
-    """Get the path to the config.ini file."""
+    """Get the path to the config.ini file.
+    
+    The result is cached for the lifetime of the process, so the directory
+    walk (and BITCOIN_TEST_CONFIG) is only evaluated once.
+    """
     # Allow override via environment variable
     env_config_path = os.environ.get("BITCOIN_TEST_CONFIG")
     if env_config_path:
         config_path = Path(env_config_path)
-        if config_path.exists():
-            return config_path
-        raise FileNotFoundError(f"Config file specified in BITCOIN_TEST_CONFIG not found: {env_config_path}")
+        try:
+            os.stat(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file specified in BITCOIN_TEST_CONFIG not found: {env_config_path}")
+        return config_path
     
     # Search up the directory tree for config.ini
     current_dir = Path(__file__).resolve().parent
-    for parent in [current_dir] + list(current_dir.parents):
+    for parent in (current_dir, *current_dir.parents):
         config_path = parent / "config.ini"
-        if config_path.exists():
-            return config_path
+        try:
+            os.stat(config_path)
+        except FileNotFoundError:
+            continue
+        return config_path
     
     raise FileNotFoundError("config.ini not found in repository. Please ensure it exists in the repository root.")
 
 
-def _load_config():
+def _load_config(config_path):
     """Load configuration from config.ini file."""
     config = configparser.ConfigParser()
-    config_path = _get_config_path()
     
+    # Open the file ourselves: ConfigParser.read silently skips files it cannot open
     try:
-        config.read(config_path)
+        with open(config_path, 'r') as f:
+            config.read_file(f, source=str(config_path))
     except configparser.Error as e:
         raise ValueError(f"Invalid INI syntax in {config_path}: {e}")
     except PermissionError as e:
@@ -46,49 +61,225 @@ def _load_config():
     return config
 
 
+def _option(section, option, fallback=None):
+    """Declare the config.ini section and option a setting is read from.
+    
+    Args:
+        section: config.ini section
+        option: Option name in the section
+        fallback: Raw value used when the option is missing (default: required)
+    """
+    return field(metadata={"section": section, "option": option, "fallback": fallback})
+
+
+@dataclass(frozen=True, slots=True)
+class _Settings:
+    """Typed settings exposed by this module, resolved once per process."""
+    
+    bitcoin_version: str = _option("bitcoin", "version")
+    bitcoin_download_timeout: int = _option("bitcoin", "download_timeout")
+    default_generator_port: int = _option("node", "default_generator_port")
+    default_victim_port: int = _option("node", "default_victim_port")
+    default_victim_rpc_port: int = _option("node", "default_victim_rpc_port")
+    default_bind_address: str = _option("network", "default_bind_address")
+    node_start_timeout: int = _option("timeouts", "node_start_timeout")
+    node_stop_timeout: int = _option("timeouts", "node_stop_timeout")
+    block_generation_timeout: int = _option("timeouts", "block_generation_timeout")
+    sync_timeout: int = _option("timeouts", "sync_timeout")
+    default_fault_probability_low: float = _option("fault_injection", "default_fault_probability_low")
+    default_fault_probability_high: float = _option("fault_injection", "default_fault_probability_high")
+    fault_injection_retry_max: int = _option("fault_injection", "fault_injection_retry_max")
+    fault_injection_retry_wait: int = _option("fault_injection", "fault_injection_retry_wait")
+    initial_block_count: int = _option("test", "initial_block_count")
+    additional_block_count: int = _option("test", "additional_block_count")
+    log_level_console: str = _option("logging", "log_level_console")
+    log_level_file: str = _option("logging", "log_level_file")
+    debug_log_tail_lines: int = _option("logging", "debug_log_tail_lines")
+    metrics_collection_interval: int = _option("metrics", "metrics_collection_interval")
+    metrics_enabled: bool = _option("metrics", "metrics_enabled")
+    # Added after other settings; older config.ini files poll peers every time
+    metrics_peer_info_ratio: int = _option("metrics", "metrics_peer_info_ratio", fallback="1")
+    default_generator_dir: str = _option("directories", "default_generator_dir")
+    default_victim_dir: str = _option("directories", "default_victim_dir")
+    default_wallet_name: str = _option("wallet", "default_wallet_name")
+
+
+def _to_bool(value):
+    """Convert a config value to bool the way ConfigParser.getboolean does."""
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value}")
+
+
+# Field type -> converter from the raw config.ini string
+_CONVERTERS = {str: str, int: int, float: float, bool: _to_bool}
+
+
+def _parse_settings(config):
+    """Resolve all settings from a parsed config.ini in a single pass.
+    
+    Args:
+        config: ConfigParser with config.ini loaded
+        
+    Returns:
+        _Settings instance
+    """
+    sections = {}
+    values = {}
+    for f in fields(_Settings):
+        section, option = f.metadata["section"], f.metadata["option"]
+        if section not in sections:
+            sections[section] = dict(config.items(section))
+        raw = sections[section].get(option, f.metadata["fallback"])
+        if raw is None:
+            raise configparser.NoOptionError(option, section)
+        values[f.name] = _CONVERTERS[f.type](raw)
+    return _Settings(**values)
+
+
+def _get_cache_dir():
+    """Get the per-user settings cache directory, creating it private to the user.
+    
+    Uses $XDG_CACHE_HOME (default: ~/.cache), so other local users cannot
+    plant cache files.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = Path(base) / "bitcoin-system-test"
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    return cache_dir
+
+
+def _get_cache_path(config_path):
+    """Get the settings cache file for the current state of config.ini.
+    
+    The file name is derived from the config path, its modification time
+    and size, and the settings schema, so any change yields a new cache file.
+    """
+    st = os.stat(config_path)
+    schema = [
+        (f.name, f.type.__name__, f.metadata["section"], f.metadata["option"], f.metadata["fallback"])
+        for f in fields(_Settings)
+    ]
+    key = f"{config_path}:{st.st_mtime_ns}:{st.st_size}:{schema}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return _get_cache_dir() / f"config-{digest}.json"
+
+
+def _is_private(st):
+    """Check that a file is owned by the current user and not writable by others."""
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & 0o022
+
+
+def _settings_from_cache(data):
+    """Build settings from cached JSON, if it has exactly the expected fields and types.
+    
+    Args:
+        data: Object loaded from the cache file
+        
+    Returns:
+        _Settings instance, or None if the data does not match the schema
+    """
+    settings_fields = fields(_Settings)
+    if not isinstance(data, dict) or set(data) != {f.name for f in settings_fields}:
+        return None
+    if any(type(data[f.name]) is not f.type for f in settings_fields):
+        return None
+    return _Settings(**data)
+
+
+def _load_settings():
+    """Load typed settings from config.ini.
+    
+    Parsed settings are cached as JSON in a per-user cache directory and
+    reused by later imports (e.g. in Robot Framework subprocesses) until
+    config.ini changes. Cache files not owned by the user, writable by
+    others, or not matching the settings schema are ignored. Set
+    BITCOIN_TEST_CONFIG_NOCACHE to always parse config.ini.
+    
+    Returns:
+        _Settings instance
+    """
+    config_path = _get_config_path()
+    cache_path = None
+    if not os.environ.get("BITCOIN_TEST_CONFIG_NOCACHE"):
+        try:
+            cache_path = _get_cache_path(config_path)
+        except OSError:
+            pass  # No usable cache directory; caching is best effort
+    
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'r') as f:
+                if _is_private(os.fstat(f.fileno())) and _is_private(os.stat(cache_path.parent)):
+                    settings = _settings_from_cache(json.load(f))
+                    if settings is not None:
+                        return settings
+        except (OSError, ValueError):
+            pass
+    
+    settings = _parse_settings(_load_config(config_path))
+    
+    if cache_path is not None:
+        # Write to a private temp file and rename so readers never see a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(asdict(settings), f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Caching is best effort
+    
+    return settings
+
+
 # Load configuration
-_config = _load_config()
+_CFG = _load_settings()
 
 # Bitcoin Core settings
-BITCOIN_VERSION = _config.get("bitcoin", "version")
-BITCOIN_DOWNLOAD_TIMEOUT = _config.getint("bitcoin", "download_timeout")
+BITCOIN_VERSION = _CFG.bitcoin_version
+BITCOIN_DOWNLOAD_TIMEOUT = _CFG.bitcoin_download_timeout
 
 # Node settings
-DEFAULT_GENERATOR_PORT = _config.getint("node", "default_generator_port")
-DEFAULT_VICTIM_PORT = _config.getint("node", "default_victim_port")
-DEFAULT_VICTIM_RPC_PORT = _config.getint("node", "default_victim_rpc_port")
+DEFAULT_GENERATOR_PORT = _CFG.default_generator_port
+DEFAULT_VICTIM_PORT = _CFG.default_victim_port
+DEFAULT_VICTIM_RPC_PORT = _CFG.default_victim_rpc_port
 
 # Network settings
-DEFAULT_BIND_ADDRESS = _config.get("network", "default_bind_address")
+DEFAULT_BIND_ADDRESS = _CFG.default_bind_address
 
 # Timeout settings
-NODE_START_TIMEOUT = _config.getint("timeouts", "node_start_timeout")
-NODE_STOP_TIMEOUT = _config.getint("timeouts", "node_stop_timeout")
-BLOCK_GENERATION_TIMEOUT = _config.getint("timeouts", "block_generation_timeout")
-SYNC_TIMEOUT = _config.getint("timeouts", "sync_timeout")
+NODE_START_TIMEOUT = _CFG.node_start_timeout
+NODE_STOP_TIMEOUT = _CFG.node_stop_timeout
+BLOCK_GENERATION_TIMEOUT = _CFG.block_generation_timeout
+SYNC_TIMEOUT = _CFG.sync_timeout
 
 # Fault injection settings
-DEFAULT_FAULT_PROBABILITY_LOW = _config.getfloat("fault_injection", "default_fault_probability_low")
-DEFAULT_FAULT_PROBABILITY_HIGH = _config.getfloat("fault_injection", "default_fault_probability_high")
-FAULT_INJECTION_RETRY_MAX = _config.getint("fault_injection", "fault_injection_retry_max")
-FAULT_INJECTION_RETRY_WAIT = _config.getint("fault_injection", "fault_injection_retry_wait")
+DEFAULT_FAULT_PROBABILITY_LOW = _CFG.default_fault_probability_low
+DEFAULT_FAULT_PROBABILITY_HIGH = _CFG.default_fault_probability_high
+FAULT_INJECTION_RETRY_MAX = _CFG.fault_injection_retry_max
+FAULT_INJECTION_RETRY_WAIT = _CFG.fault_injection_retry_wait
 
 # Test settings
-INITIAL_BLOCK_COUNT = _config.getint("test", "initial_block_count")
-ADDITIONAL_BLOCK_COUNT = _config.getint("test", "additional_block_count")
+INITIAL_BLOCK_COUNT = _CFG.initial_block_count
+ADDITIONAL_BLOCK_COUNT = _CFG.additional_block_count
 
 # Logging settings
-LOG_LEVEL_CONSOLE = _config.get("logging", "log_level_console")
-LOG_LEVEL_FILE = _config.get("logging", "log_level_file")
-DEBUG_LOG_TAIL_LINES = _config.getint("logging", "debug_log_tail_lines")
+LOG_LEVEL_CONSOLE = _CFG.log_level_console
+LOG_LEVEL_FILE = _CFG.log_level_file
+DEBUG_LOG_TAIL_LINES = _CFG.debug_log_tail_lines
 
 # Metrics collection settings
-METRICS_COLLECTION_INTERVAL = _config.getint("metrics", "metrics_collection_interval")
-METRICS_ENABLED = _config.getboolean("metrics", "metrics_enabled")
+METRICS_COLLECTION_INTERVAL = _CFG.metrics_collection_interval
+METRICS_ENABLED = _CFG.metrics_enabled
+METRICS_PEER_INFO_RATIO = _CFG.metrics_peer_info_ratio
 
 # Directory settings
-DEFAULT_GENERATOR_DIR = _config.get("directories", "default_generator_dir")
-DEFAULT_VICTIM_DIR = _config.get("directories", "default_victim_dir")
+DEFAULT_GENERATOR_DIR = _CFG.default_generator_dir
+DEFAULT_VICTIM_DIR = _CFG.default_victim_dir
 
 # Wallet settings
-DEFAULT_WALLET_NAME = _config.get("wallet", "default_wallet_name")
+DEFAULT_WALLET_NAME = _CFG.default_wallet_name
@@ -1,65 +1,174 @@
 """Bitcoin Core metrics collection for observability."""
 
-import json
-import os
-import subprocess
+import heapq
+import itertools
 import sys
 import threading
+import time
+from collections import deque
 from pathlib import Path
-from datetime import datetime, timezone
 
 # Import config and logging
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+_SRC_DIR = str(Path(__file__).resolve().parents[2] / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+_LIB_DIR = str(Path(__file__).resolve().parent)
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 from util.logger import get_logger
 
+# config, JSON helpers, datetime and the RPC client are imported inside the collection
+# and save methods, so importing this library costs nothing when metrics are disabled
+
+
+def _snapshot_timestamp(metrics):
+    """Get the collection time of a snapshot as an ISO 8601 string.
+    
+    Args:
+        metrics: Metrics snapshot
+        
+    Returns:
+        Formatted 'timestamp_ns', or the snapshot's 'timestamp' if it has none
+    """
+    timestamp_ns = metrics.get('timestamp_ns')
+    if timestamp_ns is None:
+        return metrics.get('timestamp')
+    
+    from datetime import datetime, timezone
+    
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    timestamp = datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=nanoseconds // 1000)
+    return timestamp.isoformat()
+
+
+def _format_snapshot(metrics):
+    """Get a snapshot for output, with its timestamp formatted as ISO 8601.
+    
+    Snapshots store the collection time as integer nanoseconds
+    ('timestamp_ns') and are only formatted when written.
+    
+    Args:
+        metrics: Metrics snapshot
+        
+    Returns:
+        Snapshot with a 'timestamp' string in place of 'timestamp_ns'
+    """
+    if 'timestamp_ns' not in metrics:
+        return metrics
+    
+    snapshot = {'timestamp': _snapshot_timestamp(metrics)}
+    snapshot.update((key, value) for key, value in metrics.items() if key != 'timestamp_ns')
+    return snapshot
+
+
+class _NodeCollection:
+    """Collection state of a single node, polled by the scheduler thread."""
+    
+    def __init__(self, node_name, datadir, interval, rpcport, peer_info_ratio=1, stream=None):
+        self.node_name = node_name
+        self.datadir = datadir
+        self.interval = interval
+        self.rpcport = rpcport
+        self.peer_info_ratio = peer_info_ratio
+        self.stream = stream
+        self.rpc = None
+        self.stopped = False
+        self.polls = 0
+        self.peer_info = None
+    
+    def close(self):
+        """Close the RPC connection and the metrics stream, if open."""
+        if self.rpc is not None:
+            self.rpc.close()
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
 
 class MetricsCollector:
-    """Collects Bitcoin Core metrics periodically during test execution."""
+    """Collects Bitcoin Core metrics periodically during test execution.
+    
+    All nodes are polled from a single scheduler thread: each node has its
+    own interval and next due time, and the thread sleeps until the earliest
+    one instead of every node waking its own thread.
+    """
     
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     
     def __init__(self):
         """Initialize MetricsCollector."""
         self.logger = get_logger('metrics_collector')
-        self.collection_threads = {}
-        self.stop_events = {}
+        self.collections = {}
+        # Per-node deques are appended to only by the scheduler thread and
+        # read with list(), both atomic under the GIL, so no lock is needed
         self.metrics_data = {}
-        self.metrics_lock = threading.Lock()
+        # Running per-node aggregates for get_metrics_summary; each update
+        # replaces the node's dict, so readers always see a consistent one
+        self._aggregates = {}
+        
+        # Heap of (due time, sequence, collection) driving the scheduler thread
+        self._schedule = []
+        self._schedule_seq = itertools.count()
+        self._schedule_cond = threading.Condition()
+        self._scheduler_thread = None
+        self._polling = None
     
-    def start_metrics_collection(self, node_name, datadir, bitcoin_cli_path, interval=10, rpcport=None):
+    def start_metrics_collection(self, node_name, datadir, interval=10, rpcport=None, output_file=None,
+                                 peer_info_ratio=None):
         """Start collecting metrics for a Bitcoin Core node.
         
+        If output_file is given, every snapshot is appended to it as one JSON
+        line (NDJSON) as soon as it is collected, so the data is on disk even
+        if the test run is aborted. Use Load Metrics From Stream to read it.
+        
         Args:
             node_name: Name identifier for the node (e.g., 'generator', 'victim')
             datadir: Data directory of the node
-            bitcoin_cli_path: Path to bitcoin-cli executable
             interval: Collection interval in seconds (default: 10)
             rpcport: RPC port (optional)
+            output_file: NDJSON file to stream snapshots to (optional)
+            peer_info_ratio: Fetch getpeerinfo only every Nth interval and repeat
+                the last result in between (default: METRICS_PEER_INFO_RATIO from config)
         """
-        if node_name in self.collection_threads:
-            self.logger.warning(f"Metrics collection already running for {node_name}")
-            return
-        
-        self.logger.info(f"Starting metrics collection for {node_name} (interval: {interval}s)")
-        
-        # Initialize storage for this node
-        with self.metrics_lock:
-            self.metrics_data[node_name] = []
+        if peer_info_ratio is None:
+            import config
+            peer_info_ratio = config.METRICS_PEER_INFO_RATIO
         
-        # Create stop event
-        stop_event = threading.Event()
-        self.stop_events[node_name] = stop_event
-        
-        # Start collection thread
-        thread = threading.Thread(
-            target=self._collect_metrics_loop,
-            args=(node_name, datadir, bitcoin_cli_path, interval, rpcport, stop_event),
-            daemon=True
-        )
-        thread.start()
-        self.collection_threads[node_name] = thread
-        
-        self.logger.debug(f"Metrics collection thread started for {node_name}")
+        with self._schedule_cond:
+            if node_name in self.collections:
+                self.logger.warning(f"Metrics collection already running for {node_name}")
+                return
+            
+            self.logger.info(f"Starting metrics collection for {node_name} (interval: {interval}s)")
+            
+            # Initialize storage for this node
+            self.metrics_data[node_name] = deque()
+            self._aggregates.pop(node_name, None)
+            
+            stream = None
+            if output_file:
+                output_path = Path(output_file)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                # Kept open for the whole collection; closed by _NodeCollection.close
+                stream = open(output_path, 'ab')  # noqa: SIM115
+            
+            collection = _NodeCollection(
+                node_name, datadir, float(interval), rpcport, max(1, int(peer_info_ratio)), stream
+            )
+            self.collections[node_name] = collection
+            heapq.heappush(self._schedule, (time.monotonic(), next(self._schedule_seq), collection))
+            
+            # Start the scheduler thread on first use; it exits when idle
+            if self._scheduler_thread is None:
+                self._scheduler_thread = threading.Thread(
+                    target=self._run_scheduler,
+                    name='metrics-collector',
+                    daemon=True
+                )
+                self._scheduler_thread.start()
+            self._schedule_cond.notify_all()
+        
+        self.logger.debug(f"Metrics collection scheduled for {node_name}")
     
     def stop_metrics_collection(self, node_name):
         """Stop collecting metrics for a node.
@@ -67,40 +176,37 @@ class MetricsCollector:
         Args:
             node_name: Name identifier for the node
         """
-        if node_name not in self.collection_threads:
-            self.logger.warning(f"No metrics collection running for {node_name}")
-            return
-        
-        self.logger.info(f"Stopping metrics collection for {node_name}")
-        
-        # Signal the thread to stop
-        self.stop_events[node_name].set()
-        
-        # Wait for thread to finish; use a timeout that is at least as long as
-        # the maximum time a metrics collection RPC can block.
-        thread = self.collection_threads[node_name]
-        thread.join(timeout=10)
+        with self._schedule_cond:
+            collection = self.collections.pop(node_name, None)
+            if collection is None:
+                self.logger.warning(f"No metrics collection running for {node_name}")
+                return
+            
+            self.logger.info(f"Stopping metrics collection for {node_name}")
+            
+            collection.stopped = True
+            self._schedule_cond.notify_all()
+            
+            # Wait for an in-flight poll of this node; use a timeout that is at
+            # least as long as the maximum time a metrics collection RPC can block.
+            finished = self._schedule_cond.wait_for(lambda: self._polling is not collection, timeout=10)
+            if finished:
+                collection.close()
         
-        if thread.is_alive():
-            # The thread is still running; avoid deleting bookkeeping so that
-            # its state remains visible and it can be stopped/inspected later.
+        if not finished:
             self.logger.warning(
-                f"Metrics collection thread for {node_name} did not stop within the timeout; "
-                "it may still be running."
+                f"Metrics collection for {node_name} did not finish its last poll within the timeout; "
+                "its result will be discarded."
             )
             return
         
-        # Cleanup only after the thread has terminated
-        del self.collection_threads[node_name]
-        del self.stop_events[node_name]
-        
         self.logger.debug(f"Metrics collection stopped for {node_name}")
     
     def stop_all_metrics_collection(self):
-        """Stop all metrics collection threads."""
+        """Stop metrics collection for all nodes."""
         self.logger.info("Stopping all metrics collection")
         
-        node_names = list(self.collection_threads.keys())
+        node_names = list(self.collections.keys())
         for node_name in node_names:
             self.stop_metrics_collection(node_name)
     
@@ -111,21 +217,43 @@ class MetricsCollector:
             node_name: Name identifier for the node
             output_file: Output file path
         """
-        with self.metrics_lock:
-            if node_name not in self.metrics_data:
-                self.logger.warning(f"No metrics data found for {node_name}")
-                return
-            
-            metrics_snapshot = self.metrics_data[node_name].copy()
+        if node_name not in self.metrics_data:
+            self.logger.warning(f"No metrics data found for {node_name}")
+            return
+        
+        metrics_snapshot = list(self.metrics_data[node_name])
+        
+        from util.util import json_dumps
         
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(metrics_snapshot, f, indent=2)
+        # Encode one snapshot at a time into a large write buffer rather
+        # than building the whole JSON document in memory
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(b'[')
+            for i, metrics in enumerate(metrics_snapshot):
+                if i:
+                    f.write(b',')
+                f.write(json_dumps(_format_snapshot(metrics)))
+            f.write(b']')
         
         self.logger.info(f"Saved {len(metrics_snapshot)} metrics snapshots for {node_name} to {output_file}")
     
+    def load_metrics_from_stream(self, stream_file):
+        """Load the snapshots streamed to an NDJSON file.
+        
+        Args:
+            stream_file: NDJSON file written by Start Metrics Collection
+            
+        Returns:
+            List of metrics snapshots
+        """
+        from util.util import json_loads
+        
+        with open(stream_file, 'rb') as f:
+            return [json_loads(line) for line in f if line.strip()]
+    
     def get_metrics_summary(self, node_name):
         """Get a summary of collected metrics.
         
@@ -135,112 +263,209 @@ class MetricsCollector:
         Returns:
             Dictionary with metrics summary
         """
-        with self.metrics_lock:
-            if node_name not in self.metrics_data:
-                return {}
-            
-            metrics = self.metrics_data[node_name].copy()
-        
-        if not metrics:
+        agg = self._aggregates.get(node_name)
+        if not agg:
             return {}
         
-        # Calculate summary statistics
-        block_counts = [m.get('blockchain_info', {}).get('blocks', 0) for m in metrics]
-        peer_counts = [len(m.get('peer_info', [])) for m in metrics]
-        
         summary = {
-            'total_snapshots': len(metrics),
-            'first_snapshot': metrics[0].get('timestamp'),
-            'last_snapshot': metrics[-1].get('timestamp'),
-            'initial_block_count': block_counts[0] if block_counts else 0,
-            'final_block_count': block_counts[-1] if block_counts else 0,
-            'blocks_synced': block_counts[-1] - block_counts[0] if block_counts else 0,
-            'avg_peer_count': sum(peer_counts) / len(peer_counts) if peer_counts else 0,
-            'max_peer_count': max(peer_counts) if peer_counts else 0,
+            'total_snapshots': agg['count'],
+            'first_snapshot': _snapshot_timestamp(agg['first']),
+            'last_snapshot': _snapshot_timestamp(agg['last']),
+            'initial_block_count': agg['first_blocks'],
+            'final_block_count': agg['last_blocks'],
+            'blocks_synced': agg['last_blocks'] - agg['first_blocks'],
+            'avg_peer_count': agg['peer_sum'] / agg['count'],
+            'max_peer_count': agg['peer_max'],
         }
         
         return summary
     
-    def _collect_metrics_loop(self, node_name, datadir, bitcoin_cli_path, interval, rpcport, stop_event):
-        """Background loop to collect metrics periodically.
+    def _record_metrics(self, node_name, metrics):
+        """Store a snapshot and fold it into the node's summary aggregates.
         
         Args:
             node_name: Name identifier for the node
-            datadir: Data directory of the node
-            bitcoin_cli_path: Path to bitcoin-cli executable
-            interval: Collection interval in seconds
-            rpcport: RPC port (optional)
-            stop_event: Threading event to signal stop
+            metrics: Metrics snapshot
         """
-        while not stop_event.is_set():
+        blocks = metrics.get('blockchain_info', {}).get('blocks', 0)
+        peers = len(metrics.get('peer_info', []))
+        
+        agg = self._aggregates.get(node_name)
+        if agg is None:
+            agg = {'count': 0, 'peer_sum': 0, 'peer_max': 0, 'first': metrics, 'first_blocks': blocks}
+        agg = {
+            **agg,
+            'count': agg['count'] + 1,
+            'peer_sum': agg['peer_sum'] + peers,
+            'peer_max': max(agg['peer_max'], peers),
+            'last': metrics,
+            'last_blocks': blocks,
+        }
+        
+        self.metrics_data.setdefault(node_name, deque()).append(metrics)
+        self._aggregates[node_name] = agg
+    
+    def _run_scheduler(self):
+        """Poll all scheduled nodes, each at its own interval, until none are left."""
+        from util.rpc import BitcoinRPC
+        from util.util import json_dumps
+        
+        while True:
+            with self._schedule_cond:
+                collection = self._next_due_collection()
+                if collection is None:
+                    self._scheduler_thread = None
+                    return
+                self._polling = collection
+            
+            # One keep-alive RPC connection per node, only used by this thread
+            if collection.rpc is None:
+                collection.rpc = BitcoinRPC(collection.datadir, collection.rpcport, timeout=10)
+            
+            metrics = None
             try:
-                metrics = self._collect_node_metrics(node_name, datadir, bitcoin_cli_path, rpcport)
-                if metrics:
-                    with self.metrics_lock:
-                        self.metrics_data[node_name].append(metrics)
-                    self.logger.debug(f"Collected metrics for {node_name}: blocks={metrics.get('blockchain_info', {}).get('blocks', 'N/A')}, peers={len(metrics.get('peer_info', []))}")
+                metrics = self._collect_node_metrics(collection)
             except Exception as e:
-                self.logger.error(f"Error collecting metrics for {node_name}: {e}")
+                self.logger.error(f"Error collecting metrics for {collection.node_name}: {e}")
+            
+            # Stream the snapshot without holding the schedule lock; the stream
+            # is only closed once this node is no longer being polled
+            if metrics and collection.stream is not None:
+                self._write_stream(collection, json_dumps(_format_snapshot(metrics)) + b'\n')
+            
+            with self._schedule_cond:
+                self._polling = None
+                if collection.stopped:
+                    collection.close()
+                else:
+                    if metrics:
+                        self._record_metrics(collection.node_name, metrics)
+                        self.logger.debug(
+                            "Collected metrics for %s: blocks=%s, peers=%d",
+                            collection.node_name,
+                            metrics.get('blockchain_info', {}).get('blocks', 'N/A'),
+                            len(metrics.get('peer_info', []))
+                        )
+                    due = time.monotonic() + collection.interval
+                    heapq.heappush(self._schedule, (due, next(self._schedule_seq), collection))
+                self._schedule_cond.notify_all()
+    
+    def _write_stream(self, collection, line):
+        """Append a line to a node's metrics stream.
+        
+        If the write fails (e.g. the disk is full), the stream is closed and
+        dropped so collection continues in memory only.
+        
+        Args:
+            collection: _NodeCollection of the node
+            line: Encoded NDJSON line
+        """
+        stream = collection.stream
+        try:
+            stream.write(line)
+            stream.flush()
+        except OSError as e:
+            self.logger.error(f"Error writing metrics stream for {collection.node_name}, streaming stopped: {e}")
+            collection.stream = None
+            try:
+                stream.close()
+            except OSError:
+                pass
+    
+    def _next_due_collection(self):
+        """Wait until the earliest scheduled node is due and pop it.
+        
+        Must be called with the schedule condition held. Stopped nodes are
+        dropped from the schedule and their RPC connections and streams closed.
+        
+        Returns:
+            The due _NodeCollection, or None if nothing is scheduled
+        """
+        while self._schedule:
+            due, _, collection = self._schedule[0]
+            if collection.stopped:
+                heapq.heappop(self._schedule)
+                collection.close()
+                continue
             
-            # Wait for interval or stop signal
-            stop_event.wait(timeout=interval)
+            delay = due - time.monotonic()
+            if delay <= 0:
+                heapq.heappop(self._schedule)
+                return collection
+            self._schedule_cond.wait(timeout=delay)
+        
+        return None
     
-    def _collect_node_metrics(self, node_name, datadir, bitcoin_cli_path, rpcport):
+    def _collect_node_metrics(self, collection):
         """Collect metrics from a Bitcoin Core node.
         
+        getblockchaininfo is fetched on every poll. getpeerinfo returns a
+        large array that changes slowly, so it is only fetched every
+        peer_info_ratio polls (or until it first succeeds) and the last
+        result is reused in between.
+        
         Args:
-            node_name: Name identifier for the node
-            datadir: Data directory of the node
-            bitcoin_cli_path: Path to bitcoin-cli executable
-            rpcport: RPC port (optional)
+            collection: _NodeCollection of the node
             
         Returns:
             Dictionary with collected metrics
         """
         metrics = {
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'node_name': node_name,
+            'timestamp_ns': time.time_ns(),
+            'node_name': collection.node_name,
         }
         
-        # Collect getblockchaininfo
-        blockchain_info = self._execute_rpc(bitcoin_cli_path, datadir, 'getblockchaininfo', rpcport)
+        # Collect getblockchaininfo, batched with getpeerinfo when that is due
+        if collection.peer_info is None or collection.polls % collection.peer_info_ratio == 0:
+            blockchain_info, collection.peer_info = self._execute_rpc_batch(
+                collection.rpc, ['getblockchaininfo', 'getpeerinfo']
+            )
+        else:
+            blockchain_info = self._execute_rpc(collection.rpc, 'getblockchaininfo')
+        collection.polls += 1
+        
+        # Never report peers carried over from an earlier poll with the
+        # timestamp of a failed one; refetch them on the next poll instead
+        if blockchain_info is None:
+            collection.peer_info = None
+        
         if blockchain_info:
             metrics['blockchain_info'] = blockchain_info
-        
-        # Collect getpeerinfo
-        peer_info = self._execute_rpc(bitcoin_cli_path, datadir, 'getpeerinfo', rpcport)
-        if peer_info:
-            metrics['peer_info'] = peer_info
+        if collection.peer_info:
+            metrics['peer_info'] = collection.peer_info
         
         return metrics
     
-    def _execute_rpc(self, bitcoin_cli_path, datadir, command, rpcport=None):
-        """Execute an RPC command and return parsed JSON result.
+    def _execute_rpc(self, rpc, command):
+        """Execute an RPC command and return its result.
         
         Args:
-            bitcoin_cli_path: Path to bitcoin-cli executable
-            datadir: Data directory
+            rpc: BitcoinRPC client for the node
             command: RPC command to execute
-            rpcport: RPC port (optional)
             
         Returns:
-            Parsed JSON result or None on error
+            RPC result or None on error
         """
-        cmd = [bitcoin_cli_path, "-regtest", f"-datadir={datadir}"]
-        
-        if rpcport:
-            cmd.append(f"-rpcport={rpcport}")
-        
-        cmd.append(command)
-        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            else:
-                # Node might not be ready yet, don't log error
-                return None
-        except Exception:
+            return rpc.call(command)
+        except RuntimeError:
             # Silently handle errors (node might not be ready)
             return None
+    
+    def _execute_rpc_batch(self, rpc, commands):
+        """Execute several RPC commands in a single request.
+        
+        Args:
+            rpc: BitcoinRPC client for the node
+            commands: RPC commands to execute
+            
+        Returns:
+            List of RPC results, None for each command that failed
+        """
+        try:
+            results = rpc.batch([(command, []) for command in commands], raise_errors=False)
+        except RuntimeError:
+            # Silently handle errors (node might not be ready)
+            return [None] * len(commands)
+        # Commands fail independently, as with separate calls
+        return [None if isinstance(result, RuntimeError) else result for result in results]
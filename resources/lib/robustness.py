@@ -1,19 +1,27 @@
 """Robustness testing library with fault injection support."""
 
-import os
 import subprocess
 import sys
 import time
 from pathlib import Path
 
 # Add paths for importing config and util modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-sys.path.insert(0, os.path.dirname(__file__))
+_SRC_DIR = str(Path(__file__).resolve().parents[2] / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+_LIB_DIR = str(Path(__file__).resolve().parent)
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 
 # Import config and logging
 import config
 from util.decorators import retry_on_error
 from util.logger import get_logger
+from util.util import is_process_running, tail_lines, wait_for_process
+
+# Seconds a fault-injected victim node must stay up after start; injected
+# I/O faults usually make it exit during initialization
+_VICTIM_STARTUP_WINDOW = 3
 
 
 class RobustnessLib:
@@ -29,25 +37,22 @@ class RobustnessLib:
         """
         self.bitcoin_version = bitcoin_version or config.BITCOIN_VERSION
         self.bitcoin_dir = f"bitcoin-{self.bitcoin_version}"
-        self.bitcoind = f"{self.bitcoin_dir}/bin/bitcoind"
-        self.bitcoin_cli = f"{self.bitcoin_dir}/bin/bitcoin-cli"
+        self._bin_dir = Path(self.bitcoin_dir, "bin")
+        self.bitcoind = str(self._bin_dir / "bitcoind")
+        self.bitcoin_cli = str(self._bin_dir / "bitcoin-cli")
         self.logger = get_logger('robustness')
+        self._node_files = {}
 
     def install_libfiu(self):
         """Install libfiu development package and utilities."""
         self.logger.info("Installing libfiu-dev and fiu-utils")
         
-        # Update package list
-        result = subprocess.run(
-            ["sudo", "apt-get", "update", "-qq"],
-            capture_output=True,
-            text=True
-        )
-        
-        # Install libfiu
+        # Update package list and install libfiu under a single sudo; a failed
+        # update does not prevent installing from the existing package lists
         result = subprocess.run(
-            ["sudo", "apt-get", "install", "-y", "libfiu-dev", "fiu-utils"],
-            capture_output=True,
+            ["sudo", "sh", "-c", "apt-get update -qq; apt-get install -y libfiu-dev fiu-utils"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True
         )
         
@@ -57,6 +62,25 @@ class RobustnessLib:
         
         self.logger.info("libfiu installed successfully")
 
+    def _node_file(self, datadir, name):
+        """Get the path of a file in a regtest node's data directory.
+        
+        Paths are cached per data directory, as the same node files are
+        looked up repeatedly while starting and monitoring nodes.
+        
+        Args:
+            datadir: Data directory
+            name: File name inside the regtest directory
+            
+        Returns:
+            Path to the file
+        """
+        key = (datadir, name)
+        path = self._node_files.get(key)
+        if path is None:
+            path = self._node_files[key] = Path(datadir) / "regtest" / name
+        return path
+
     def _check_node_exited(self, datadir):
         """Check if node has exited by checking PID file and process.
         
@@ -66,20 +90,7 @@ class RobustnessLib:
         Returns:
             True if node has exited, False if still running
         """
-        pid_file = Path(datadir) / "regtest" / "bitcoind.pid"
-        
-        if not pid_file.exists():
-            return True  # PID file doesn't exist, node not running
-        
-        try:
-            with open(pid_file, 'r') as f:
-                pid = int(f.read().strip())
-            
-            # Check if process exists
-            os.kill(pid, 0)
-            return False  # Process exists, still running
-        except (OSError, ValueError):
-            return True  # Process doesn't exist or error reading PID
+        return not is_process_running(self._node_file(datadir, "bitcoind.pid"))
 
     @retry_on_error(max_retries=config.FAULT_INJECTION_RETRY_MAX, wait_time=config.FAULT_INJECTION_RETRY_WAIT)
     def _start_victim_node(self, bitcoind_path, datadir, port, rpcport, connect, probability):
@@ -98,19 +109,27 @@ class RobustnessLib:
             "-daemon"
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         
         if result.returncode != 0:
             self.logger.error(f"Failed to start victim node: {result.stderr}")
             raise RuntimeError(f"Failed to start victim node: {result.stderr}")
         
-        # Give it a moment to start
-        time.sleep(3)
-        
-        # Check if node is actually running after start
-        if self._check_node_exited(datadir):
-            self.logger.warning("Victim node exited shortly after start (likely due to fault injection)")
-            raise RuntimeError("Victim node exited shortly after start (likely due to fault injection)")
+        # Wait for the daemon to write its PID file, then make sure it stays
+        # up for the rest of the startup window
+        deadline = time.monotonic() + _VICTIM_STARTUP_WINDOW
+        if not wait_for_process(self._node_file(datadir, "bitcoind.pid"), _VICTIM_STARTUP_WINDOW):
+            self.logger.warning("Victim node did not start (likely due to fault injection)")
+            raise RuntimeError("Victim node did not start (likely due to fault injection)")
+        
+        while True:
+            if self._check_node_exited(datadir):
+                self.logger.warning("Victim node exited shortly after start (likely due to fault injection)")
+                raise RuntimeError("Victim node exited shortly after start (likely due to fault injection)")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(0.1, remaining))
         
         self.logger.info("Victim node started successfully")
 
@@ -149,12 +168,13 @@ class RobustnessLib:
         if daemon:
             cmd.append("-daemon")
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         
         if result.returncode != 0:
             raise RuntimeError(f"Failed to start generator node: {result.stderr}")
         
-        time.sleep(2)  # Wait for node to start
+        if daemon and not wait_for_process(self._node_file(datadir, "bitcoind.pid"), config.NODE_START_TIMEOUT):
+            raise RuntimeError(f"Generator node did not start within {config.NODE_START_TIMEOUT} seconds")
 
     def tail_debug_log(self, datadir, lines=100):
         """Display the last N lines of debug.log.
@@ -166,21 +186,17 @@ class RobustnessLib:
         Returns:
             Last N lines as string
         """
-        log_path = Path(datadir) / "regtest" / "debug.log"
+        log_path = self._node_file(datadir, "debug.log")
         
-        if not log_path.exists():
+        try:
+            output = tail_lines(log_path, int(lines))
+        except FileNotFoundError:
             return "Debug log not found"
         
-        result = subprocess.run(
-            ["tail", "-n", str(lines), str(log_path)],
-            capture_output=True,
-            text=True
-        )
-        
         print(f"=== Last {lines} lines of {log_path} ===")
-        print(result.stdout)
+        print(output)
         
-        return result.stdout
+        return output
 
     def copy_debug_log_to(self, datadir, destination):
         """Copy debug.log to a destination for artifacts.
@@ -189,7 +205,7 @@ class RobustnessLib:
             datadir: Data directory
             destination: Destination file path
         """
-        log_path = Path(datadir) / "regtest" / "debug.log"
+        log_path = self._node_file(datadir, "debug.log")
         
         if not log_path.exists():
             print(f"Debug log not found at {log_path}")
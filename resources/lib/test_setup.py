@@ -5,7 +5,9 @@ import sys
 from pathlib import Path
 
 # Add src to path to import test_setup
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+_SRC_DIR = str(Path(__file__).resolve().parents[2] / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 from util.test_setup import setup_results_directory
 
 
@@ -8,12 +8,18 @@ from pathlib import Path
 from datetime import datetime, timezone
 
 
-def run_robot_test(test_file, test_suite_name=None):
+def run_robot_test(test_file, test_suite_name=None, return_returncode=True):
     """Run Robot Framework test with timestamped results directory.
     
     Args:
         test_file: Path to the Robot Framework test file
         test_suite_name: Name for the results directory (defaults to test file name)
+        return_returncode: Run robot as a child process and return its exit
+            code (default: True). If False, the current process is replaced
+            by robot and this function does not return.
+    
+    Returns:
+        Exit code of robot
     """
     # Determine test suite name
     if test_suite_name is None:
@@ -27,21 +33,23 @@ def run_robot_test(test_file, test_suite_name=None):
     print(f"Running test: {test_file}")
     print(f"Results directory: {results_dir}")
     
-    # Add current directory to PYTHONPATH so resources can be imported
-    env = os.environ.copy()
-    pythonpath = env.get('PYTHONPATH', '')
+    # Add current directory to PYTHONPATH so resources can be imported, and
+    # export results directory for Python libraries to use
     current_dir = os.getcwd()
-    if pythonpath:
-        env['PYTHONPATH'] = f"{current_dir}:{pythonpath}"
-    else:
-        env['PYTHONPATH'] = current_dir
-    
-    # Export results directory for Python libraries to use
-    env['ROBOT_OUTPUT_DIR'] = str(results_dir)
+    env = {
+        **os.environ,
+        'PYTHONPATH': f"{current_dir}:{os.environ.get('PYTHONPATH', '')}".rstrip(':'),
+        'ROBOT_OUTPUT_DIR': str(results_dir),
+    }
     
     # Run robot with the output directory
     cmd = ["robot", "--outputdir", str(results_dir), test_file]
     
+    if not return_returncode:
+        # Nothing is left to do here, so let robot take over this process
+        sys.stdout.flush()
+        os.execvpe(cmd[0], cmd, env)
+    
     result = subprocess.run(cmd, env=env)
     
     return result.returncode
@@ -55,5 +63,4 @@ if __name__ == "__main__":
     test_file = sys.argv[1]
     test_suite_name = sys.argv[2] if len(sys.argv) > 2 else None
     
-    exit_code = run_robot_test(test_file, test_suite_name)
-    sys.exit(exit_code)
+    run_robot_test(test_file, test_suite_name, return_returncode=False)
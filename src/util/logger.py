@@ -1,9 +1,491 @@
 """Logger wrapper for dual file and console logging."""
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from pathlib import Path
-from datetime import datetime, timezone
+import threading
+import time
+
+
+# Number of records buffered per log file before they are written
+_BUFFER_CAPACITY = 1024
+
+# Maximum seconds a record stays buffered, so a run killed by a timeout
+# (which skips atexit) still leaves its recent log lines on disk
+_FLUSH_INTERVAL = 1.0
+
+# Write buffer of the debug log, which receives every record: large enough
+# that a full batch of records reaches the file in a single write()
+_DEBUG_LOG_BUFFER_SIZE = 1 << 20
+
+# Maximum number of line prefixes cached by FastFormatter
+_PREFIX_CACHE_SIZE = 16
+
+# Running queue listeners; stopped at exit, before logging.shutdown() flushes
+# and closes the handlers behind them (atexit runs hooks in reverse order)
+_LISTENERS = set()
+
+
+def _stop_listener(listener):
+    """Stop a queue listener once, after it has handled all queued records."""
+    if listener in _LISTENERS:
+        _LISTENERS.discard(listener)
+        listener.stop()
+
+
+def _stop_all_listeners():
+    """Stop all running queue listeners."""
+    for listener in list(_LISTENERS):
+        _stop_listener(listener)
+
+
+atexit.register(_stop_all_listeners)
+
+
+def _close_handler(handler):
+    """Close a handler along with any listener or target handler behind it.
+    
+    Args:
+        handler: Handler attached by DualLogger
+    """
+    listener = getattr(handler, 'listener', None)
+    if listener is not None:
+        _stop_listener(listener)
+    
+    # MemoryHandler.close() writes the buffer to its target, then drops it
+    target = getattr(handler, 'target', None)
+    handler.close()
+    if target is not None:
+        target.close()
+    
+    if listener is not None:
+        for listener_handler in listener.handlers:
+            _close_handler(listener_handler)
+
+
+class DualFileHandler(logging.Handler):
+    """Handler appending each record to a normal and a debug log file.
+    
+    Every INFO+ record goes to both files with identical content, so the
+    record is formatted and encoded once and the same bytes are written to
+    both streams. Records below ``normal_level`` only go to the debug file.
+    
+    Bypasses the text I/O layer of logging.FileHandler: both files are
+    binary buffered writers opened with O_APPEND, so concurrent test
+    processes appending to the same log never overwrite each other.
+    """
+    
+    def __init__(self, normal_filename, debug_filename, normal_level=logging.INFO,
+                 buffer_size=1 << 16, debug_buffer_size=_DEBUG_LOG_BUFFER_SIZE):
+        """Open both log files for appending.
+        
+        Args:
+            normal_filename: Path to the normal log file
+            debug_filename: Path to the debug log file
+            normal_level: Minimum level written to the normal log (default: INFO)
+            buffer_size: Normal log write buffer size in bytes (default: 64 KiB)
+            debug_buffer_size: Debug log write buffer size in bytes (default: 1 MiB)
+        """
+        super().__init__()
+        self.normal_level = normal_level
+        self.normal_filename = os.path.abspath(normal_filename)
+        self.debug_filename = os.path.abspath(debug_filename)
+        self.normal_fd = self._open(self.normal_filename, buffer_size)
+        self.debug_fd = self._open(self.debug_filename, debug_buffer_size)
+    
+    @staticmethod
+    def _open(filename, buffer_size):
+        """Open a file for buffered binary appending."""
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+        return os.fdopen(fd, 'wb', buffering=buffer_size)
+    
+    def emit(self, record):
+        """Format a record once and append it to the matching write buffers."""
+        try:
+            msg = self.format(record).encode('utf-8') + b'\n'
+            self.debug_fd.write(msg)
+            if record.levelno >= self.normal_level:
+                self.normal_fd.write(msg)
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        """Write both buffers to their files."""
+        with self.lock:
+            for stream in (self.normal_fd, self.debug_fd):
+                if stream is not None:
+                    stream.flush()
+    
+    def close(self):
+        """Flush and close both files."""
+        with self.lock:
+            streams = (self.normal_fd, self.debug_fd)
+            self.normal_fd = self.debug_fd = None
+            try:
+                for stream in streams:
+                    if stream is not None:
+                        try:
+                            stream.flush()
+                        finally:
+                            stream.close()
+            finally:
+                super().close()
+
+
+class _BufferingHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes its target when writing out records.
+    
+    MemoryHandler.flush() only hands the buffered records to the target, which
+    leaves them in a buffered target's write buffer. Records are also written
+    once the oldest buffered one is _FLUSH_INTERVAL seconds old.
+    """
+    
+    def __init__(self, capacity, flushLevel=logging.ERROR, target=None):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self._last_flush = time.monotonic()
+    
+    def shouldFlush(self, record):
+        """Flush when full, at the flush level, or after the flush interval."""
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= _FLUSH_INTERVAL
+        )
+    
+    def flush(self):
+        """Hand all buffered records to the target and flush it."""
+        super().flush()
+        with self.lock:
+            self._last_flush = time.monotonic()
+            if self.target is not None:
+                self.target.flush()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue goes idle.
+    
+    Buffered records are written within _FLUSH_INTERVAL seconds even when
+    no further records arrive, e.g. while a hung test waits for a timeout.
+    
+    Runs its own worker thread and stop marker, so whether records are
+    still being handled can be checked with is_alive() instead of through
+    QueueListener's private attributes.
+    """
+    
+    # Queued by stop() to end the worker thread
+    _STOP = object()
+    
+    def __init__(self, queue, *handlers, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self._worker = None
+    
+    def start(self):
+        """Start the worker thread handling queued records."""
+        self._worker = threading.Thread(target=self._run, name='dual-logger', daemon=True)
+        self._worker.start()
+    
+    def stop(self):
+        """Handle all queued records, then stop the worker thread.
+        
+        Safe to call more than once, and after the thread has died.
+        """
+        worker, self._worker = self._worker, None
+        if worker is not None and worker.is_alive():
+            self.queue.put_nowait(self._STOP)
+            worker.join()
+        self.drain()
+    
+    def is_alive(self):
+        """Whether the worker thread is handling queued records."""
+        worker = self._worker
+        return worker is not None and worker.is_alive()
+    
+    def drain(self):
+        """Wait until all queued records have been handled.
+        
+        Only waits while the worker thread is running. If it has stopped or
+        died, the remaining records are handled in the calling thread, so a
+        flush never blocks forever.
+        """
+        log_queue = self.queue
+        with log_queue.all_tasks_done:
+            while log_queue.unfinished_tasks and self.is_alive():
+                log_queue.all_tasks_done.wait(0.1)
+        if self.is_alive():
+            return
+        
+        while True:
+            try:
+                record = log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not self._STOP:
+                self.handle(record)
+            log_queue.task_done()
+    
+    def dequeue(self, block):
+        """Get the next record, flushing the handlers while waiting for one."""
+        while True:
+            try:
+                return self.queue.get(block, timeout=_FLUSH_INTERVAL if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+    
+    def _run(self):
+        """Handle queued records until the stop marker is dequeued."""
+        while True:
+            record = self.dequeue(True)
+            try:
+                if record is self._STOP:
+                    return
+                self.handle(record)
+            finally:
+                self.queue.task_done()
+
+
+class CachedFormatter(logging.Formatter):
+    """Formatter that formats each record timestamp at most once per second.
+    
+    Records logged within the same second share the formatted time, so
+    strftime runs once per second instead of once per record. Only applies
+    when datefmt is set, as the default format includes milliseconds.
+    """
+    
+    def __init__(self, fmt=None, datefmt=None, style='%', validate=True, **kwargs):
+        super().__init__(fmt, datefmt, style, validate, **kwargs)
+        self._last_second = None
+        self._last_time = None
+    
+    def formatTime(self, record, datefmt=None):
+        """Format the record creation time, reusing the last result within a second."""
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_time = time.strftime(datefmt, self.converter(second))
+            self._last_second = second
+        return self._last_time
+
+
+class FastFormatter(CachedFormatter):
+    """Formatter for DualLogger's fixed record layouts.
+    
+    Produces '%(asctime)s - %(name)s - %(levelname)s - %(message)s' (or the
+    same without the name) by direct string formatting instead of parsing
+    the %-style format string for every record.
+    """
+    
+    def __init__(self, include_name=True, datefmt='%Y-%m-%d %H:%M:%S'):
+        """Initialize the formatter.
+        
+        Args:
+            include_name: Include the logger name in each line (default: True)
+            datefmt: strftime format of the timestamp
+        """
+        super().__init__(datefmt=datefmt)
+        self.include_name = include_name
+        # (second, levelno, name) -> line prefix up to the message
+        self._prefix_cache = {}
+    
+    def format(self, record):
+        """Format a record, appending exception and stack info like logging.Formatter.
+        
+        Records logged within the same second at the same level by the same
+        logger share their prefix, so each record only concatenates its
+        message to a cached string.
+        """
+        record.message = record.getMessage()
+        name = record.name if self.include_name else None
+        key = (int(record.created), record.levelno, name)
+        prefix = self._prefix_cache.get(key)
+        if prefix is None:
+            asctime = self.formatTime(record, self.datefmt)
+            if name is not None:
+                prefix = f"{asctime} - {name} - {record.levelname} - "
+            else:
+                prefix = f"{asctime} - {record.levelname} - "
+            # Keys of past seconds are never hit again; keep the cache small
+            if len(self._prefix_cache) >= _PREFIX_CACHE_SIZE:
+                self._prefix_cache.clear()
+            self._prefix_cache[key] = prefix
+        s = prefix + record.message
+        
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = f"{s}\n{record.exc_text}"
+        if record.stack_info:
+            s = f"{s}\n{self.formatStack(record.stack_info)}"
+        return s
+
+
+def _buffered(handler):
+    """Wrap a file handler so records are written in batches.
+    
+    Records are held in memory and written when the buffer is full, a
+    WARNING (or worse) is logged, or within _FLUSH_INTERVAL seconds.
+    logging.shutdown() flushes the buffers at interpreter exit.
+    
+    Args:
+        handler: File handler to write to
+        
+    Returns:
+        MemoryHandler with the same level as the file handler
+    """
+    buffered = _BufferingHandler(
+        _BUFFER_CAPACITY, flushLevel=logging.WARNING, target=handler
+    )
+    buffered.setLevel(handler.level)
+    return buffered
+
+
+def _detach_handlers(logger):
+    """Remove all handlers from a logger, closing them so buffered records are written.
+    
+    Args:
+        logger: logging.Logger to detach the handlers from
+    """
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        _close_handler(handler)
+
+
+def _attach_handlers(logger, normal_log, debug_log, console_level):
+    """Attach console and log file handlers to a logger.
+    
+    Handlers attached earlier for the same files and console level are
+    reused instead of closing and reopening the files; any other handlers
+    are replaced. The console handler is the listener's first handler.
+    
+    Args:
+        logger: logging.Logger to attach the handlers to
+        normal_log: Path to the normal log file
+        debug_log: Path to the debug log file
+        console_level: Console logging level
+        
+    Returns:
+        QueueHandler attached to the logger
+    """
+    tag = (os.path.abspath(normal_log), os.path.abspath(debug_log), console_level)
+    for handler in logger.handlers:
+        if getattr(handler, '_dual_tag', None) == tag:
+            return handler
+    
+    _detach_handlers(logger)
+    os.makedirs(os.path.dirname(tag[0]), exist_ok=True)
+    
+    # Create formatters
+    detailed_formatter = FastFormatter(include_name=True)
+    simple_formatter = FastFormatter(include_name=False)
+    
+    # Console handler (INFO level)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(simple_formatter)
+    
+    # Both log files are written by one handler, so each record is
+    # formatted once: INFO+ goes to both files, everything to the debug log
+    file_handler = DualFileHandler(normal_log, debug_log)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(detailed_formatter)
+    
+    # The logger only enqueues records; a background thread formats and
+    # writes them, so callers never wait on console or file I/O
+    log_queue = queue.Queue(-1)
+    listener = _FlushingQueueListener(
+        log_queue,
+        console_handler,
+        _buffered(file_handler),
+        respect_handler_level=True
+    )
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.listener = listener
+    queue_handler._dual_tag = tag
+    logger.addHandler(queue_handler)
+    
+    _LISTENERS.add(listener)
+    listener.start()
+    return queue_handler
+
+
+# Parent logger whose handlers are shared by the DualLoggers without a log directory
+_ROOT_LOGGER_NAME = 'dualroot'
+
+
+class _ConsoleLevelFilter(logging.Filter):
+    """Apply each logger's own console level on the shared root console handler."""
+    
+    def __init__(self, default_level=logging.INFO):
+        """Initialize the filter.
+        
+        Args:
+            default_level: Console level of loggers without their own level
+        """
+        super().__init__()
+        self.default_level = default_level
+        # logger name -> console level
+        self.levels = {}
+    
+    def filter(self, record):
+        """Pass records at or above the console level of their logger."""
+        return record.levelno >= self.levels.get(record.name, self.default_level)
+
+
+def _root_log_paths(log_dir):
+    """Get the normal and debug log paths of the shared root logger."""
+    return (
+        os.path.join(log_dir, f"{_ROOT_LOGGER_NAME}.log"),
+        os.path.join(log_dir, f"{_ROOT_LOGGER_NAME}.debug.log"),
+    )
+
+
+def _root_handler():
+    """Get the handler attached by configure_root_dual(), if any."""
+    for handler in logging.getLogger(_ROOT_LOGGER_NAME).handlers:
+        if hasattr(handler, 'console_filter'):
+            return handler
+    return None
+
+
+def configure_root_dual(log_dir=None, console_level=logging.INFO):
+    """Attach one set of console and log file handlers for the default loggers.
+    
+    The handlers go on the 'dualroot' logger. DualLoggers created without a
+    log directory then log through a 'dualroot.<name>' child that propagates
+    to these handlers instead of opening their own files, so any number of
+    named loggers shares two open log files. Records keep their logger name
+    in the log line, and each logger keeps its own console level.
+    
+    Args:
+        log_dir: Directory for log files (default: results/logs)
+        console_level: Console level of loggers without their own (default: INFO)
+        
+    Returns:
+        Tuple of (normal_log_path, debug_log_path)
+    """
+    if log_dir is None:
+        log_dir = os.path.join("results", "logs")
+    
+    root = logging.getLogger(_ROOT_LOGGER_NAME)
+    root.setLevel(logging.DEBUG)
+    previous = _root_handler()
+    normal_log, debug_log = _root_log_paths(log_dir)
+    
+    # The console handler passes everything; the filter applies the levels
+    handler = _attach_handlers(root, normal_log, debug_log, logging.DEBUG)
+    if handler is not previous:
+        handler.console_filter = _ConsoleLevelFilter()
+        if previous is not None:
+            handler.console_filter.levels.update(previous.console_filter.levels)
+        handler.listener.handlers[0].addFilter(handler.console_filter)
+    handler.console_filter.default_level = console_level
+    return normal_log, debug_log
 
 
 class DualLogger:
@@ -12,75 +494,75 @@ class DualLogger:
     def __init__(self, name, log_dir=None, console_level=logging.INFO):
         """Initialize the dual logger.
         
+        Loggers without a log directory share the handlers of the root logger
+        set up by configure_root_dual(); loggers with a log directory get
+        their own log files.
+        
         Args:
             name: Logger name
-            log_dir: Directory for log files (default: results/logs)
+            log_dir: Directory for log files (default: shared results/logs files)
             console_level: Console logging level (default: INFO)
         """
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)  # Capture everything
-        self.logger.handlers.clear()  # Clear any existing handlers
-        
-        # Determine log directory
         if log_dir is None:
-            log_dir = Path("results") / "logs"
+            if _root_handler() is None:
+                configure_root_dual(console_level=console_level)
+            # Drop files a standalone logger of this name may have opened
+            _detach_handlers(logging.getLogger(name))
+            self.logger = logging.getLogger(f"{_ROOT_LOGGER_NAME}.{name}")
+            self._queue_handler = _root_handler()
+            self._queue_handler.console_filter.levels[self.logger.name] = console_level
+            normal_log, debug_log = self._queue_handler._dual_tag[:2]
         else:
-            log_dir = Path(log_dir)
+            self.logger = logging.getLogger(name)
+            normal_log = os.path.join(log_dir, f"{name}.log")
+            debug_log = os.path.join(log_dir, f"{name}.debug.log")
+            self._queue_handler = _attach_handlers(self.logger, normal_log, debug_log, console_level)
         
-        log_dir.mkdir(parents=True, exist_ok=True)
+        self.logger.setLevel(logging.DEBUG)  # Capture everything
+        self._shared = log_dir is None
+        self._queue = self._queue_handler.queue
+        self._listener = self._queue_handler.listener
+        self.normal_log_path = normal_log
+        self.debug_log_path = debug_log
+        self._bind_level_methods()
+    
+    def _bind_level_methods(self):
+        """Expose the logger's level methods directly on this instance.
         
-        # Create formatters
-        detailed_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        simple_formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        debug(), info(), warning(), error() and critical() are the bound
+        methods of the underlying logging.Logger, so a log call skips a
+        wrapper frame and its attribute lookups. The logger checks whether the
+        level is enabled before creating a record.
+        """
+        logger = self.logger
+        self.debug = logger.debug
+        self.info = logger.info
+        self.warning = logger.warning
+        self.error = logger.error
+        self.critical = logger.critical
+    
+    def flush(self):
+        """Write all queued and buffered records to the console and log files."""
+        self._listener.drain()
+        for handler in self._listener.handlers:
+            handler.flush()
+    
+    def close(self):
+        """Write all pending records, then detach and close the handlers.
+        
+        Handlers shared through the root logger stay open for the other
+        loggers; their pending records are only written. The logger is
+        dropped from the get_logger() cache, so a later call creates a new one.
+        """
+        with _LOGGER_CACHE_LOCK:
+            for key in [k for k, v in _LOGGER_CACHE.items() if v is self]:
+                del _LOGGER_CACHE[key]
         
-        # Console handler (INFO level)
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(console_level)
-        console_handler.setFormatter(simple_formatter)
-        self.logger.addHandler(console_handler)
-        
-        # Normal log file handler (INFO level)
-        normal_log = log_dir / f"{name}.log"
-        normal_handler = logging.FileHandler(normal_log, mode='a')
-        normal_handler.setLevel(logging.INFO)
-        normal_handler.setFormatter(detailed_formatter)
-        self.logger.addHandler(normal_handler)
-        
-        # Debug log file handler (DEBUG level)
-        debug_log = log_dir / f"{name}.debug.log"
-        debug_handler = logging.FileHandler(debug_log, mode='a')
-        debug_handler.setLevel(logging.DEBUG)
-        debug_handler.setFormatter(detailed_formatter)
-        self.logger.addHandler(debug_handler)
-        
-        self.normal_log_path = str(normal_log)
-        self.debug_log_path = str(debug_log)
-    
-    def debug(self, message):
-        """Log a debug message."""
-        self.logger.debug(message)
-    
-    def info(self, message):
-        """Log an info message."""
-        self.logger.info(message)
-    
-    def warning(self, message):
-        """Log a warning message."""
-        self.logger.warning(message)
-    
-    def error(self, message):
-        """Log an error message."""
-        self.logger.error(message)
-    
-    def critical(self, message):
-        """Log a critical message."""
-        self.logger.critical(message)
+        if self._shared:
+            self.flush()
+            return
+        self.logger.removeHandler(self._queue_handler)
+        _close_handler(self._queue_handler)
     
     def get_log_paths(self):
         """Get paths to the log files.
@@ -91,9 +573,17 @@ class DualLogger:
         return self.normal_log_path, self.debug_log_path
 
 
+# (name, log_dir, console_level) -> DualLogger returned by get_logger
+_LOGGER_CACHE = {}
+_LOGGER_CACHE_LOCK = threading.Lock()
+
+
 def get_logger(name, log_dir=None, console_level=logging.INFO):
     """Get or create a DualLogger instance.
     
+    Loggers are cached, so repeated calls with the same arguments share one
+    set of handlers and open log files instead of reopening them.
+    
     Args:
         name: Logger name
         log_dir: Directory for log files
@@ -102,4 +592,13 @@ def get_logger(name, log_dir=None, console_level=logging.INFO):
     Returns:
         DualLogger instance
     """
-    return DualLogger(name, log_dir, console_level)
+    key = (name, str(log_dir) if log_dir is not None else None, console_level)
+    with _LOGGER_CACHE_LOCK:
+        logger = _LOGGER_CACHE.get(key)
+        if logger is None:
+            # A new DualLogger replaces the handlers of the named logger, so
+            # cached instances for the same name with other settings are stale
+            for stale_key in [k for k in _LOGGER_CACHE if k[0] == name]:
+                del _LOGGER_CACHE[stale_key]
+            logger = _LOGGER_CACHE[key] = DualLogger(name, log_dir, console_level)
+        return logger
@@ -0,0 +1,157 @@
+"""Bitcoin Core JSON-RPC client over a persistent HTTP connection."""
+
+import base64
+import http.client
+import os
+from urllib.parse import quote
+
+from util.util import json_dumps, json_loads
+
+# Default RPC port of a regtest node
+REGTEST_RPC_PORT = 18443
+
+# Read-only RPC methods that are safe to resend if the node may have seen them
+_IDEMPOTENT_METHODS = frozenset({
+    "echo", "estimatesmartfee", "getbalance", "getbalances", "getbestblockhash",
+    "getblock", "getblockchaininfo", "getblockcount", "getblockhash",
+    "getblockheader", "getblockstats", "getchaintips", "getconnectioncount",
+    "getdifficulty", "getindexinfo", "getmempoolinfo", "getmemoryinfo",
+    "getmininginfo", "getnettotals", "getnetworkinfo", "getpeerinfo",
+    "getrawmempool", "getrawtransaction", "gettransaction", "gettxout",
+    "getwalletinfo", "help", "listunspent", "listtransactions", "listwallets",
+    "uptime",
+})
+
+
+class BitcoinRPC:
+    """JSON-RPC client for a regtest node using cookie authentication.
+
+    The HTTP connection is kept alive between calls, so repeated calls avoid
+    both the bitcoin-cli fork/exec and a new TCP connection per call.
+    """
+
+    def __init__(self, datadir, rpcport=None, host="127.0.0.1", timeout=900):
+        """Initialize the RPC client.
+
+        Args:
+            datadir: Data directory of the node (used to find the .cookie file)
+            rpcport: RPC port (default: regtest default port)
+            host: RPC host (default: 127.0.0.1)
+            timeout: Socket timeout in seconds (default: 900, as bitcoin-cli)
+        """
+        self.host = host
+        self.port = int(rpcport) if rpcport else REGTEST_RPC_PORT
+        self.timeout = timeout
+        self.cookie_file = os.path.join(datadir, "regtest", ".cookie")
+        self._conn = None
+        self._auth_header = None
+        self._next_id = 0
+
+    def call(self, method, params=None, wallet=None):
+        """Execute a single RPC call.
+
+        Args:
+            method: RPC method name
+            params: List of positional parameters (optional)
+            wallet: Wallet name for wallet RPCs (optional)
+
+        Returns:
+            The RPC result
+
+        Raises:
+            RuntimeError: If the request fails or the node returns an error
+        """
+        return self._result(method, self._post(self._request(method, params), wallet))
+
+    def batch(self, calls, wallet=None, raise_errors=True):
+        """Execute several RPC calls in a single HTTP request.
+
+        Args:
+            calls: List of (method, params) tuples
+            wallet: Wallet name for wallet RPCs (optional)
+            raise_errors: Raise if any call returns an error (default: True).
+                If False, a failed call's RuntimeError is returned in place
+                of its result, so the other calls' results are kept.
+
+        Returns:
+            List of RPC results in the order of calls
+
+        Raises:
+            RuntimeError: If the request fails, or a call returns an error and
+                raise_errors is True
+        """
+        requests = [self._request(method, params) for method, params in calls]
+        responses = {response.get("id"): response for response in self._post(requests, wallet)}
+        results = []
+        for request in requests:
+            try:
+                results.append(self._result(request["method"], responses.get(request["id"], {})))
+            except RuntimeError as e:
+                if raise_errors:
+                    raise
+                results.append(e)
+        return results
+
+    def close(self):
+        """Close the HTTP connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _request(self, method, params):
+        """Build a JSON-RPC request object."""
+        self._next_id += 1
+        return {"jsonrpc": "1.0", "id": self._next_id, "method": method, "params": list(params or [])}
+
+    def _result(self, method, response):
+        """Extract the result from a JSON-RPC response object."""
+        error = response.get("error")
+        if error:
+            raise RuntimeError(f"RPC call {method} failed: {error.get('message')} (code {error.get('code')})")
+        if "result" not in response:
+            raise RuntimeError(f"RPC call {method} failed: no response")
+        return response["result"]
+
+    def _post(self, payload, wallet=None):
+        """POST a JSON-RPC payload and return the decoded response body."""
+        path = f"/wallet/{quote(wallet, safe='')}" if wallet else "/"
+        body = json_dumps(payload)
+        requests = payload if isinstance(payload, list) else [payload]
+        idempotent = all(request["method"] in _IDEMPOTENT_METHODS for request in requests)
+
+        for attempt in range(2):
+            reused = self._conn is not None
+            sent = False
+            try:
+                if self._auth_header is None:
+                    with open(self.cookie_file, 'r') as f:
+                        token = base64.b64encode(f.read().strip().encode()).decode()
+                    self._auth_header = f"Basic {token}"
+                if self._conn is None:
+                    self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                self._conn.request("POST", path, body, {
+                    "Authorization": self._auth_header,
+                    "Content-Type": "application/json",
+                })
+                sent = True
+                response = self._conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                # The node may have dropped an idle kept-alive connection. Only
+                # resend if it cannot have executed the request a second time.
+                if reused and attempt == 0 and (not sent or idempotent):
+                    continue
+                raise RuntimeError(f"RPC request to {self.host}:{self.port} failed: {e}")
+
+            if response.status == 401:
+                # The cookie is regenerated each time the node restarts
+                self._auth_header = None
+                if attempt == 0:
+                    continue
+                raise RuntimeError(f"RPC authentication to {self.host}:{self.port} failed")
+
+            try:
+                return json_loads(data)
+            except ValueError:
+                raise RuntimeError(f"RPC request failed: HTTP {response.status} {response.reason}")
@@ -1,8 +1,15 @@
 """Test setup utilities for Robot Framework tests."""
 
+import logging
 import os
 from datetime import datetime, timezone
-from pathlib import Path
+
+
+# Timestamp shared by all results directories created in this run
+_RUN_TIMESTAMP = None
+
+# test_suite_name -> results directory path
+_RESULTS_DIR_CACHE = {}
 
 
 def setup_results_directory(test_suite_name):
@@ -10,22 +17,33 @@ def setup_results_directory(test_suite_name):
     
     Creates directory in format: results/YYYY-MM-DD-HH-MM-SS/testsuite-name
     
+    The timestamp is taken on the first call, so all suites of a run share
+    one timestamped directory. The directory is created on the first call
+    for a suite; repeated calls return the same path without touching the
+    filesystem.
+    
     Args:
         test_suite_name: Name of the test suite
         
     Returns:
         Path to the created results directory
     """
-    # Get current UTC timestamp
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H-%M-%S")
+    global _RUN_TIMESTAMP
+    
+    results_path = _RESULTS_DIR_CACHE.get(test_suite_name)
+    if results_path is not None:
+        return results_path
     
-    # Create results path
-    results_path = Path("results") / timestamp / test_suite_name
-    results_path.mkdir(parents=True, exist_ok=True)
+    # Get current UTC timestamp
+    if _RUN_TIMESTAMP is None:
+        _RUN_TIMESTAMP = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H-%M-%S")
     
-    print(f"Created results directory: {results_path}")
+    results_path = os.path.join("results", _RUN_TIMESTAMP, test_suite_name)
+    os.makedirs(results_path, exist_ok=True)
+    logging.getLogger(__name__).debug("Created results directory: %s", results_path)
     
-    return str(results_path)
+    _RESULTS_DIR_CACHE[test_suite_name] = results_path
+    return results_path
 
 
 def get_results_directory(test_suite_name):
@@ -0,0 +1,157 @@
+"""Miscellaneous helpers shared by the test libraries."""
+
+import json
+import os
+import time
+
+# orjson is an optional, much faster JSON codec; fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj):
+    """Serialize an object to compact JSON.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data):
+    """Deserialize JSON.
+
+    Args:
+        data: JSON document as bytes or string
+
+    Returns:
+        Deserialized object
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def tail_lines(path, lines, bytes_per_line=200):
+    """Get the last N lines of a file, like ``tail -n``.
+
+    Reads backwards from the end of the file in a growing window so only
+    the tail of a large log is read.
+
+    Args:
+        path: Path to the file
+        lines: Number of lines to retrieve
+        bytes_per_line: Initial guess of the average line length in bytes
+
+    Returns:
+        Last N lines of the file as string
+    """
+    if lines <= 0:
+        return ""
+
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        window = min(size, lines * bytes_per_line)
+        while True:
+            f.seek(size - window)
+            data = f.read(window)
+
+            # Walk back over N newlines, ignoring the one terminating the file
+            pos = len(data) - 1 if data.endswith(b"\n") else len(data)
+            for _ in range(lines):
+                pos = data.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    break
+
+            if pos >= 0 or window == size:
+                break
+            window = min(size, window * 2)
+
+    return data[pos + 1:].decode('utf-8', errors='replace')
+
+
+# PID file path -> (st_mtime_ns, pid) of the last successful read
+_PID_CACHE = {}
+
+
+def read_pid_file(pid_file):
+    """Read the process ID stored in a PID file.
+
+    The PID is cached per file and only re-read when the file's
+    modification time changes, so repeated liveness checks cost one stat.
+
+    Args:
+        pid_file: Path to the PID file
+
+    Returns:
+        PID as integer, or None if the file is missing or invalid
+    """
+    key = os.fspath(pid_file)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+        cached = _PID_CACHE.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(key, 'r') as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        _PID_CACHE.pop(key, None)
+        return None
+
+    _PID_CACHE[key] = (mtime, pid)
+    return pid
+
+
+def is_process_running(pid_file):
+    """Check if the process recorded in a PID file is running.
+
+    Args:
+        pid_file: Path to the PID file
+
+    Returns:
+        True if the process exists, False otherwise
+    """
+    pid = read_pid_file(pid_file)
+    if pid is None:
+        return False
+
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def wait_for_process(pid_file, timeout):
+    """Wait until the process recorded in a PID file is running.
+
+    Polls with exponential backoff (capped at 1s), so a daemon that writes
+    its PID file quickly is detected within a few milliseconds.
+
+    Args:
+        pid_file: Path to the PID file
+        timeout: Maximum time to wait in seconds
+
+    Returns:
+        True if the process is running, False if the timeout expired
+    """
+    deadline = time.monotonic() + float(timeout)
+    delay = 0.05
+    while True:
+        if is_process_running(pid_file):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 1.0)
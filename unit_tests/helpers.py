@@ -0,0 +1,31 @@
+"""Shared fixtures for the unit tests."""
+
+import logging
+import os
+import sys
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import util.logger
+from util.logger import _detach_handlers, configure_root_dual
+
+
+def isolate_logging(test_case, log_dir):
+    """Send the output of loggers without a log directory to log_dir for one test.
+
+    Loggers created by get_logger() share the handlers of the 'dualroot'
+    logger, which write to ./results/logs by default. For the duration of
+    the test those handlers and the logger cache are replaced, so the
+    libraries under test log to log_dir instead.
+
+    Args:
+        test_case: TestCase to register the cleanups on
+        log_dir: Directory for the log files
+    """
+    root = logging.getLogger('dualroot')
+    for patcher in (mock.patch.object(root, 'handlers', []), mock.patch.dict(util.logger._LOGGER_CACHE, clear=True)):
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+    test_case.addCleanup(_detach_handlers, root)
+    configure_root_dual(log_dir)
@@ -0,0 +1,31 @@
+"""Unit tests for the base test library."""
+
+import unittest
+import sys
+import os
+
+# Add resources/lib to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'resources', 'lib'))
+import config
+from base_test import BaseTest
+
+
+class TestConfigValues(unittest.TestCase):
+    """Test cases for config lookups."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.base = BaseTest()
+
+    def test_public_setting_returned(self):
+        """Test that public settings can be looked up by name."""
+        self.assertEqual(self.base.get_config_value('BITCOIN_VERSION'), config.BITCOIN_VERSION)
+
+    def test_private_names_excluded(self):
+        """Test that private module attributes are not exposed as settings."""
+        self.assertIsNone(self.base.get_config_value('_CFG'))
+        self.assertFalse(any(key.startswith('_') for key in self.base._config_values))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Unit tests for the Bitcoin Core library."""
+
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+import hashlib
+import importlib
+import io
+from pathlib import Path
+import sys
+import os
+
+# Add resources/lib to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'resources', 'lib'))
+from unit_tests.helpers import isolate_logging
+
+
+class FakeHTTPSConnection:
+    """Serves canned responses keyed by host and path, recording each request."""
+
+    def __init__(self, responses, requests, host, timeout=None):
+        self.responses = responses
+        self.requests = requests
+        self.host = host
+
+    def request(self, method, path):
+        self.requests.append((self, self.host, path))
+
+    def getresponse(self):
+        status, headers, body = self.responses[self.requests[-1][1:]]
+        response = mock.Mock(status=status, reason='', getheader=headers.get)
+        response.read = io.BytesIO(body).read
+        return response
+
+    def close(self):
+        pass
+
+
+class TestExecuteBitcoinCli(unittest.TestCase):
+    """Test cases for running bitcoin-cli style commands over RPC."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+
+        isolate_logging(self, Path(self.test_dir) / 'logs')
+
+        # Imported here so the module's logger writes to the test directory
+        bitcoin_core = importlib.import_module('bitcoin_core')
+        self.lib = bitcoin_core.BitcoinCore(bitcoin_version='27.0')
+        self.rpc = mock.Mock()
+        self.lib._rpc_clients[(self.test_dir, None)] = self.rpc
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_json_params_converted(self):
+        """Test that arguments bitcoin-cli sends as JSON are converted."""
+        self.rpc.call.return_value = ['hash']
+
+        output = self.lib.execute_bitcoin_cli(self.test_dir, 'generatetoaddress 101 bcrt1qaddress 5')
+
+        self.rpc.call.assert_called_once_with('generatetoaddress', [101, 'bcrt1qaddress', 5], wallet=None)
+        self.assertEqual(output, '[\n  "hash"\n]')
+
+    def test_string_params_kept(self):
+        """Test that names and labels that look like JSON scalars stay strings."""
+        self.rpc.call.return_value = {'name': '123'}
+
+        self.lib.execute_bitcoin_cli(self.test_dir, 'createwallet 123 false true')
+        self.rpc.call.assert_called_with('createwallet', ['123', False, True], wallet=None)
+
+        self.lib.execute_bitcoin_cli(self.test_dir, 'setlabel bcrt1qaddress null', rpcwallet='true')
+        self.rpc.call.assert_called_with('setlabel', ['bcrt1qaddress', 'null'], wallet='true')
+
+    def test_control_params_converted(self):
+        """Test that numeric arguments of network and control methods are converted."""
+        self.rpc.call.return_value = None
+
+        self.lib.execute_bitcoin_cli(self.test_dir, 'setmocktime 1700000000')
+        self.rpc.call.assert_called_with('setmocktime', [1700000000], wallet=None)
+
+        self.lib.execute_bitcoin_cli(self.test_dir, 'setban 10.0.0.1 add 60 false')
+        self.rpc.call.assert_called_with('setban', ['10.0.0.1', 'add', 60, False], wallet=None)
+
+    def test_unknown_method_with_args_raises(self):
+        """Test that arguments of methods with unknown types are not guessed."""
+        with self.assertRaisesRegex(RuntimeError, 'pass the command as a list'):
+            self.lib.execute_bitcoin_cli(self.test_dir, 'newrpcmethod 1 true')
+        self.rpc.call.assert_not_called()
+
+        self.rpc.call.return_value = 0
+        self.assertEqual(self.lib.execute_bitcoin_cli(self.test_dir, 'newrpcmethod'), '0')
+
+    def test_json_objects_converted(self):
+        """Test that JSON arrays and objects are converted at JSON positions."""
+        self.rpc.call.return_value = [{'success': True}]
+
+        self.lib.execute_bitcoin_cli(self.test_dir, 'importdescriptors [{"desc":"x","timestamp":"now"}]')
+
+        self.rpc.call.assert_called_once_with('importdescriptors', [[{'desc': 'x', 'timestamp': 'now'}]], wallet=None)
+
+    def test_command_list_sent_as_is(self):
+        """Test that a pre-tokenized command keeps its parameter types."""
+        self.rpc.call.return_value = None
+
+        output = self.lib.execute_bitcoin_cli(self.test_dir, ['setlabel', 'bcrt1qaddress', '1'])
+
+        self.rpc.call.assert_called_once_with('setlabel', ['bcrt1qaddress', '1'], wallet=None)
+        self.assertEqual(output, '')
+
+    def test_string_result_returned_unquoted(self):
+        """Test that string results are returned like bitcoin-cli prints them."""
+        self.rpc.call.return_value = 'bcrt1qaddress'
+
+        self.assertEqual(self.lib.execute_bitcoin_cli(self.test_dir, 'getnewaddress'), 'bcrt1qaddress')
+
+
+
+class TestDownloadFiles(unittest.TestCase):
+    """Test cases for downloading release files."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+
+        isolate_logging(self, Path(self.test_dir) / 'logs')
+
+        bitcoin_core = importlib.import_module('bitcoin_core')
+        self.lib = bitcoin_core.BitcoinCore(bitcoin_version='27.0')
+        self.responses = {}
+        self.requests = []
+        patcher = mock.patch.object(
+            bitcoin_core.http.client, 'HTTPSConnection',
+            lambda host, timeout=None: FakeHTTPSConnection(self.responses, self.requests, host, timeout)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_redirects_followed(self):
+        """Test that redirects are followed, reusing the connection per host."""
+        self.responses.update({
+            ('example.org', '/bin/SHA256SUMS'): (200, {}, b'sums'),
+            ('example.org', '/bin/SHA256SUMS.asc'): (302, {'Location': '/mirror/SHA256SUMS.asc'}, b''),
+            ('example.org', '/mirror/SHA256SUMS.asc'): (301, {'Location': 'https://cdn.example.org/a?b=1'}, b''),
+            ('cdn.example.org', '/a?b=1'): (200, {}, b'signature'),
+        })
+
+        digests = self.lib._download_files(
+            ['https://example.org/bin/SHA256SUMS', 'https://example.org/bin/SHA256SUMS.asc'], timeout=1
+        )
+
+        self.assertEqual(Path('SHA256SUMS.asc').read_bytes(), b'signature')
+        self.assertEqual(digests['SHA256SUMS.asc'], hashlib.sha256(b'signature').hexdigest())
+        self.assertEqual(len({conn for conn, _, _ in self.requests}), 2)
+
+    def test_redirect_loop_raises(self):
+        """Test that endless redirects fail instead of looping."""
+        self.responses[('example.org', '/loop')] = (302, {'Location': '/loop'}, b'')
+
+        with self.assertRaisesRegex(RuntimeError, 'redirects'):
+            self.lib._download_files(['https://example.org/loop'], timeout=1)
+
+    def test_http_redirect_refused(self):
+        """Test that a redirect away from HTTPS is refused."""
+        self.responses[('example.org', '/file')] = (301, {'Location': 'http://example.org/file'}, b'')
+
+        with self.assertRaisesRegex(RuntimeError, 'non-HTTPS'):
+            self.lib._download_files(['https://example.org/file'], timeout=1)
+
+    def test_error_status_raises(self):
+        """Test that other non-200 statuses fail the download."""
+        self.responses[('example.org', '/missing')] = (404, {}, b'')
+
+        with self.assertRaisesRegex(RuntimeError, 'HTTP 404'):
+            self.lib._download_files(['https://example.org/missing'], timeout=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
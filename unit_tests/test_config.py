@@ -1,6 +1,12 @@
 """Unit tests for config module."""
 
+import configparser
 import unittest
+import tempfile
+import shutil
+import json
+from dataclasses import FrozenInstanceError, asdict, fields
+from unittest import mock
 import sys
 import os
 
@@ -12,6 +18,18 @@ import config
 class TestConfig(unittest.TestCase):
     """Test cases for configuration module."""
     
+    def setUp(self):
+        """Set up test fixtures."""
+        # Keep the settings cache out of the user's cache directory
+        self.test_dir = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self.test_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
     def test_bitcoin_settings(self):
         """Test that Bitcoin settings are defined."""
         self.assertIsInstance(config.BITCOIN_VERSION, str)
@@ -34,6 +52,83 @@ class TestConfig(unittest.TestCase):
         self.assertIsInstance(config.DEFAULT_FAULT_PROBABILITY_HIGH, float)
         self.assertIsInstance(config.FAULT_INJECTION_RETRY_MAX, int)
 
+    
+    def test_settings_cache_matches_config(self):
+        """Test that cached settings match a fresh parse of config.ini."""
+        with mock.patch.dict(os.environ, {'BITCOIN_TEST_CONFIG_NOCACHE': '1'}):
+            fresh = config._load_settings()
+        
+        # First call may populate the cache, second call reads it back
+        config._load_settings()
+        cached = config._load_settings()
+        
+        self.assertEqual(cached, fresh)
+        cache_path = config._get_cache_path(config._get_config_path())
+        self.assertTrue(cache_path.is_relative_to(self.test_dir))
+        self.assertEqual(os.stat(cache_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(cache_path.parent).st_mode & 0o777, 0o700)
+        for f in fields(fresh):
+            self.assertIs(type(getattr(cached, f.name)), f.type)
+    
+    def _write_cache(self, **overrides):
+        """Write a settings cache file with some values replaced."""
+        cache_path = config._get_cache_path(config._get_config_path())
+        with open(cache_path, 'w') as f:
+            json.dump({**asdict(config._CFG), **overrides}, f)
+        os.chmod(cache_path, 0o600)
+        return cache_path
+    
+    def test_mistyped_cache_ignored(self):
+        """Test that cached values of the wrong type are not trusted."""
+        self._write_cache(default_generator_dir=['/'])
+        
+        self.assertEqual(config._load_settings(), config._CFG)
+    
+    def test_shared_writable_cache_ignored(self):
+        """Test that a cache file writable by other users is not trusted."""
+        cache_path = self._write_cache(default_generator_dir='/planted')
+        self.assertEqual(config._load_settings().default_generator_dir, '/planted')
+        
+        self._write_cache(default_generator_dir='/planted')
+        os.chmod(cache_path, 0o666)
+        self.assertEqual(config._load_settings(), config._CFG)
+    
+    def test_missing_optional_setting_uses_fallback(self):
+        """Test that a config.ini without metrics_peer_info_ratio still loads."""
+        parser = config._load_config(config._get_config_path())
+        parser.remove_option('metrics', 'metrics_peer_info_ratio')
+        
+        self.assertEqual(config._parse_settings(parser).metrics_peer_info_ratio, 1)
+    
+    def test_missing_required_setting_raises(self):
+        """Test that a missing setting without fallback is reported."""
+        parser = config._load_config(config._get_config_path())
+        parser.remove_option('node', 'default_generator_port')
+        
+        with self.assertRaises(configparser.NoOptionError):
+            config._parse_settings(parser)
+    
+    def test_settings_are_frozen(self):
+        """Test that the resolved settings cannot be modified."""
+        with self.assertRaises(FrozenInstanceError):
+            config._CFG.bitcoin_version = "0.0"
+
+    
+    def test_unreadable_config_raises(self):
+        """Test that an unreadable config.ini is reported instead of skipped."""
+        with (
+            mock.patch('builtins.open', side_effect=PermissionError('Permission denied')),
+            self.assertRaisesRegex(PermissionError, 'Cannot read configuration file'),
+        ):
+            config._load_config('config.ini')
+    
+    def test_invalid_syntax_raises(self):
+        """Test that malformed INI syntax raises ValueError."""
+        with tempfile.NamedTemporaryFile('w', suffix='.ini', dir=self.test_dir) as f:
+            f.write('no section header\n')
+            f.flush()
+            with self.assertRaisesRegex(ValueError, 'Invalid INI syntax'):
+                config._load_config(f.name)
 
 if __name__ == '__main__':
     unittest.main()
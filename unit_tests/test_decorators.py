@@ -0,0 +1,65 @@
+"""Unit tests for decorators."""
+
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from util.decorators import retry_on_error
+
+
+class TestRetryOnError(unittest.TestCase):
+    """Test cases for retry_on_error decorator."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.calls = 0
+        patcher = mock.patch('util.decorators.time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+        stdout_patcher = mock.patch('util.decorators.sys.__stdout__')
+        stdout_patcher.start()
+        self.addCleanup(stdout_patcher.stop)
+
+    def _flaky(self, failures):
+        """Return a function failing the given number of times before succeeding."""
+        def func():
+            self.calls += 1
+            if self.calls <= failures:
+                raise RuntimeError(f"failure {self.calls}")
+            return "ok"
+        return func
+
+    def test_succeeds_after_retries(self):
+        """Test that the result is returned once a retry succeeds."""
+        func = retry_on_error(max_retries=2, wait_time=5)(self._flaky(2))
+
+        self.assertEqual(func(), "ok")
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.sleep.call_args_list, [mock.call(5), mock.call(5)])
+
+    def test_last_exception_propagates(self):
+        """Test that the exception of the final attempt is raised."""
+        func = retry_on_error(max_retries=1, wait_time=0)(self._flaky(5))
+
+        with self.assertRaisesRegex(RuntimeError, "failure 2"):
+            func()
+        self.assertEqual(self.calls, 2)
+
+    def test_random_wait_chosen_per_call(self):
+        """Test that the random wait is only rolled when a call fails."""
+        with mock.patch('util.decorators.random.randint', return_value=12) as randint:
+            func = retry_on_error(max_retries=2)(self._flaky(1))
+            randint.assert_not_called()
+
+            self.assertEqual(func(), "ok")
+            self.assertEqual(func(), "ok")
+
+        randint.assert_called_once_with(10, 20)
+        self.sleep.assert_called_once_with(12)
+
+
+if __name__ == '__main__':
+    unittest.main()
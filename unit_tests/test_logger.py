@@ -1,15 +1,22 @@
 """Unit tests for logger utility."""
 
+import io
 import unittest
 import tempfile
 import shutil
 from pathlib import Path
 import sys
 import os
+import threading
+import time
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-from util.logger import DualLogger, get_logger
+import logging
+from unittest import mock
+from util.logger import (
+    CachedFormatter, DualFileHandler, DualLogger, FastFormatter, _detach_handlers, configure_root_dual, get_logger
+)
 
 
 class TestDualLogger(unittest.TestCase):
@@ -22,8 +29,7 @@ class TestDualLogger(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
     
     def test_logger_creation(self):
         """Test that logger is created with correct handlers."""
@@ -33,6 +39,9 @@ class TestDualLogger(unittest.TestCase):
         normal_log, debug_log = logger.get_log_paths()
         self.assertTrue(os.path.exists(normal_log))
         self.assertTrue(os.path.exists(debug_log))
+        
+        # Level methods call the underlying logger directly
+        self.assertEqual(logger.info, logger.logger.info)
     
     def test_logging_levels(self):
         """Test that different log levels work correctly."""
@@ -42,24 +51,271 @@ class TestDualLogger(unittest.TestCase):
         logger.info("Info message")
         logger.warning("Warning message")
         logger.error("Error message")
+        logger.flush()
         
         # Check that messages are written to files
         normal_log, debug_log = logger.get_log_paths()
         
+        messages = ("Debug message", "Info message")
+        
         with open(debug_log, 'r') as f:
-            debug_content = f.read()
-            self.assertIn("Debug message", debug_content)
-            self.assertIn("Info message", debug_content)
+            debug_found = {msg for line in f for msg in messages if msg in line}
+            self.assertEqual(debug_found, {"Debug message", "Info message"})
         
         with open(normal_log, 'r') as f:
-            normal_content = f.read()
-            self.assertNotIn("Debug message", normal_content)
-            self.assertIn("Info message", normal_content)
+            normal_found = {msg for line in f for msg in messages if msg in line}
+            self.assertEqual(normal_found, {"Info message"})
+    
+    def test_records_buffered_until_flush(self):
+        """Test that INFO file writes are deferred until a flush or a WARNING."""
+        with mock.patch('util.logger._FLUSH_INTERVAL', 60):
+            logger = DualLogger("test_buffered", log_dir=self.log_dir)
+            _, debug_log = logger.get_log_paths()
+            
+            logger.info("Buffered message")
+            logger._queue.join()
+            self.assertEqual(os.path.getsize(debug_log), 0)
+            
+            logger.warning("Warning message")
+            logger._queue.join()
+            with open(debug_log, 'r') as f:
+                content = f.read()
+            self.assertIn("Buffered message", content)
+            self.assertIn("Warning message", content)
+            logger.close()
+    
+    def test_records_written_after_flush_interval(self):
+        """Test that buffered records reach the file without a flush once the queue is idle."""
+        with mock.patch('util.logger._FLUSH_INTERVAL', 0.05):
+            logger = DualLogger("test_interval", log_dir=self.log_dir)
+            logger.info("Idle message")
+            
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and os.path.getsize(logger.debug_log_path) == 0:
+                time.sleep(0.01)
+            with open(logger.debug_log_path, 'r') as f:
+                self.assertIn("Idle message", f.read())
+            logger.close()
+    
+    def test_many_records_written(self):
+        """Test that more records than one memory buffer holds all reach the files."""
+        logger = DualLogger("test_many", log_dir=self.log_dir)
+        for i in range(3000):
+            logger.debug(f"Record {i}")
+        logger.flush()
+        
+        with open(logger.debug_log_path, 'r') as f:
+            self.assertEqual(sum(1 for _ in f), 3000)
+        self.assertTrue(logger._listener.is_alive())
+    
+    def test_flush_with_stopped_listener(self):
+        """Test that flush writes queued records itself once the listener thread is gone."""
+        logger = DualLogger("test_stopped", log_dir=self.log_dir)
+        logger._listener.stop()
+        self.assertFalse(logger._listener.is_alive())
+        
+        logger.info("After stop")
+        logger.flush()
+        
+        with open(logger.normal_log_path, 'r') as f:
+            self.assertIn("After stop", f.read())
+    
+    def test_debug_format_args(self):
+        """Test that debug messages with %-style arguments are formatted when written."""
+        logger = DualLogger("test_lazy", log_dir=self.log_dir)
+        
+        logger.debug("Collected %s: blocks=%d", "node", 150)
+        logger.flush()
+        
+        with open(logger.get_log_paths()[1], 'r') as f:
+            self.assertIn("Collected node: blocks=150", f.read())
     
     def test_get_logger_function(self):
         """Test the get_logger helper function."""
         logger = get_logger("helper_test", log_dir=self.log_dir)
         self.assertIsInstance(logger, DualLogger)
+        
+        # Same arguments return the cached logger, other arguments replace it
+        self.assertIs(get_logger("helper_test", log_dir=str(self.log_dir)), logger)
+        other = get_logger("helper_test", log_dir=Path(self.test_dir) / "other")
+        self.assertIsNot(other, logger)
+        self.assertIsNot(get_logger("helper_test", log_dir=self.log_dir), logger)
+    
+    def test_get_logger_after_close(self):
+        """Test that get_logger does not return a closed logger."""
+        logger = get_logger("closed_test", log_dir=self.log_dir)
+        logger.close()
+        
+        reopened = get_logger("closed_test", log_dir=self.log_dir)
+        self.assertIsNot(reopened, logger)
+        reopened.info("After reopen")
+        reopened.flush()
+        with open(reopened.normal_log_path, 'r') as f:
+            self.assertIn("After reopen", f.read())
+    
+    def test_rebuild_reuses_handlers(self):
+        """Test that rebuilding a logger for the same files keeps its handlers."""
+        first = DualLogger("test_reuse", log_dir=self.log_dir)
+        second = DualLogger("test_reuse", log_dir=self.log_dir)
+        self.assertIs(second._queue_handler, first._queue_handler)
+        self.assertEqual(len(second.logger.handlers), 1)
+        
+        second.info("Shared message")
+        second.flush()
+        with open(second.normal_log_path, 'r') as f:
+            self.assertIn("Shared message", f.read())
+        
+        other = DualLogger("test_reuse", log_dir=Path(self.test_dir) / "other")
+        self.assertIsNot(other._queue_handler, first._queue_handler)
+        self.assertEqual(other.logger.handlers, [other._queue_handler])
+    
+    def test_root_handlers_shared(self):
+        """Test that loggers without a log directory share the root's files."""
+        root = logging.getLogger('dualroot')
+        with mock.patch.object(root, 'handlers', []), mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            normal_log, debug_log = configure_root_dual(self.log_dir)
+            node_a = DualLogger("node_a")
+            node_b = DualLogger("node_b", console_level=logging.DEBUG)
+            standalone = DualLogger("node_c", log_dir=self.log_dir)
+            
+            self.assertIs(node_a._queue_handler, node_b._queue_handler)
+            self.assertEqual(node_a.logger.handlers, [])
+            self.assertEqual(node_a.get_log_paths(), (os.path.abspath(normal_log), os.path.abspath(debug_log)))
+            
+            # An explicit log directory keeps its own files, even the root's directory
+            self.assertIsNot(standalone._queue_handler, node_a._queue_handler)
+            self.assertEqual(standalone.get_log_paths()[0], os.path.join(self.log_dir, "node_c.log"))
+            
+            node_a.info("From A")
+            node_a.debug("Debug from A")
+            node_b.debug("Debug from B")
+            node_a.flush()
+            with open(debug_log, 'r') as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines[0].endswith("dualroot.node_a - INFO - From A"))
+            self.assertTrue(lines[2].endswith("dualroot.node_b - DEBUG - Debug from B"))
+            
+            # Each logger keeps its own console level
+            console = stdout.getvalue()
+            self.assertIn("From A", console)
+            self.assertNotIn("Debug from A", console)
+            self.assertIn("Debug from B", console)
+            
+            standalone.close()
+            _detach_handlers(root)
+
+
+class TestDualFileHandler(unittest.TestCase):
+    """Test cases for DualFileHandler."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.normal_log = os.path.join(self.test_dir, "test.log")
+        self.debug_log = os.path.join(self.test_dir, "test.debug.log")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_formats_once_for_both_files(self):
+        """Test that INFO+ records are formatted once and written to both files."""
+        handler = DualFileHandler(self.normal_log, self.debug_log)
+        handler.setFormatter(FastFormatter())
+        calls = []
+        handler.format = lambda record: calls.append(record) or record.getMessage()
+        
+        for level, msg in ((logging.DEBUG, "debug"), (logging.INFO, "info"), (logging.ERROR, "error")):
+            handler.handle(logging.LogRecord("test", level, __file__, 1, msg, None, None))
+        handler.close()
+        
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(Path(self.normal_log).read_text(), "info\nerror\n")
+        self.assertEqual(Path(self.debug_log).read_text(), "debug\ninfo\nerror\n")
+    
+    def test_close_waits_for_emit(self):
+        """Test that close() does not close the files under a record being written."""
+        handler = DualFileHandler(self.normal_log, self.debug_log)
+        formatting = threading.Event()
+        release = threading.Event()
+        
+        def format_record(record):
+            formatting.set()
+            release.wait(5)
+            return record.getMessage()
+        
+        handler.format = format_record
+        handler.handleError = mock.Mock()
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+        emitter = threading.Thread(target=handler.handle, args=(record,))
+        emitter.start()
+        self.assertTrue(formatting.wait(5))
+        
+        closer = threading.Thread(target=handler.close)
+        closer.start()
+        closer.join(0.1)
+        self.assertTrue(closer.is_alive())
+        
+        release.set()
+        emitter.join(5)
+        closer.join(5)
+        handler.handleError.assert_not_called()
+        self.assertEqual(Path(self.normal_log).read_text(), "message\n")
+
+
+class TestCachedFormatter(unittest.TestCase):
+    """Test cases for CachedFormatter class."""
+    
+    def _record(self, created):
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+        record.created = created
+        return record
+    
+    def test_matches_standard_formatter(self):
+        """Test that formatted times match logging.Formatter."""
+        cached = CachedFormatter('%(asctime)s %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+        standard = logging.Formatter('%(asctime)s %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+        
+        for created in (1700000000.1, 1700000000.9, 1700000001.0, 1700003600.5):
+            record = self._record(created)
+            self.assertEqual(cached.format(record), standard.format(self._record(created)))
+
+
+class TestFastFormatter(unittest.TestCase):
+    """Test cases for FastFormatter class."""
+    
+    def test_matches_standard_formatter(self):
+        """Test that both layouts match the equivalent logging.Formatter."""
+        layouts = {
+            True: '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            False: '%(asctime)s - %(levelname)s - %(message)s',
+        }
+        for include_name, fmt in layouts.items():
+            fast = FastFormatter(include_name=include_name)
+            standard = logging.Formatter(fmt, datefmt='%Y-%m-%d %H:%M:%S')
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                exc_info = sys.exc_info()
+            for args in ((None,), (exc_info,)):
+                record = logging.LogRecord("node", logging.WARNING, __file__, 1, "value %d", (42,), *args)
+                expected = standard.format(logging.makeLogRecord(record.__dict__))
+                with self.subTest(include_name=include_name, exc_info=args[0] is not None):
+                    self.assertEqual(fast.format(record), expected)
+    
+    def test_prefix_cache(self):
+        """Test that cached prefixes follow the second, level and logger name."""
+        fast = FastFormatter()
+        standard = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        for created in range(100, 120):
+            for name in ("node_a", "node_b"):
+                for level in (logging.DEBUG, logging.INFO):
+                    record = logging.LogRecord(name, level, __file__, 1, "msg", None, None)
+                    record.created = created + 0.5
+                    self.assertEqual(fast.format(record), standard.format(logging.makeLogRecord(record.__dict__)))
+                    self.assertLessEqual(len(fast._prefix_cache), 16)
 
 
 if __name__ == '__main__':
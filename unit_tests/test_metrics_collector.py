@@ -8,10 +8,40 @@ from pathlib import Path
 import sys
 import os
 import time
+from unittest import mock
 
 # Add resources/lib to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'resources', 'lib'))
-from metrics_collector import MetricsCollector
+from metrics_collector import MetricsCollector, _NodeCollection
+from unit_tests.helpers import isolate_logging
+
+
+class FakeRPC:
+    """Records RPC calls and answers like a regtest node."""
+    
+    def __init__(self):
+        self.calls = []
+        self.requests = 0
+        self.failing = set()
+    
+    def call(self, method, params=None, wallet=None):
+        self.requests += 1
+        result = self._result(method)
+        if isinstance(result, RuntimeError):
+            raise result
+        return result
+    
+    def batch(self, calls, wallet=None, raise_errors=True):
+        self.requests += 1
+        return [self._result(method) for method, params in calls]
+    
+    def _result(self, method):
+        self.calls.append(method)
+        if method in self.failing:
+            return RuntimeError(f"RPC call {method} failed")
+        if method == 'getblockchaininfo':
+            return {'blocks': len(self.calls)}
+        return [{'id': 0}]
 
 
 class TestMetricsCollector(unittest.TestCase):
@@ -20,39 +50,85 @@ class TestMetricsCollector(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.test_dir = tempfile.mkdtemp()
+        
+        # Keep the collector's log files in the temporary directory
+        isolate_logging(self, Path(self.test_dir) / 'logs')
+        
         self.collector = MetricsCollector()
     
     def tearDown(self):
         """Clean up test fixtures."""
         self.collector.stop_all_metrics_collection()
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
     
     def test_collector_initialization(self):
         """Test that collector is initialized correctly."""
-        self.assertIsInstance(self.collector.collection_threads, dict)
+        self.assertIsInstance(self.collector.collections, dict)
         self.assertIsInstance(self.collector.metrics_data, dict)
-        self.assertEqual(len(self.collector.collection_threads), 0)
+        self.assertEqual(len(self.collector.collections), 0)
+    
+    def test_single_scheduler_thread(self):
+        """Test that all nodes are polled from one scheduler thread."""
+        for node_name in ('generator', 'victim'):
+            datadir = Path(self.test_dir) / node_name
+            self.collector.start_metrics_collection(node_name, str(datadir), interval=60, rpcport=1)
+        
+        scheduler = self.collector._scheduler_thread
+        self.assertIsNotNone(scheduler)
+        
+        # Unreachable nodes still yield a timestamped snapshot per poll
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not all(self.collector.metrics_data.values()):
+            time.sleep(0.01)
+        self.assertEqual(len(self.collector.metrics_data['generator']), 1)
+        self.assertEqual(len(self.collector.metrics_data['victim']), 1)
+        
+        self.collector.stop_all_metrics_collection()
+        scheduler.join(timeout=5)
+        self.assertFalse(scheduler.is_alive())
+        self.assertEqual(len(self.collector.collections), 0)
     
     def test_metrics_data_storage(self):
         """Test that metrics data is stored correctly."""
-        # Manually add some metrics data
-        self.collector.metrics_data['test_node'] = [
-            {'timestamp': '2024-01-01T00:00:00', 'blockchain_info': {'blocks': 100}},
-            {'timestamp': '2024-01-01T00:00:10', 'blockchain_info': {'blocks': 101}},
-        ]
+        # Manually record some metrics data
+        self.collector._record_metrics('test_node', {
+            'timestamp': '2024-01-01T00:00:00', 'blockchain_info': {'blocks': 100}, 'peer_info': [{}],
+        })
+        self.collector._record_metrics('test_node', {
+            'timestamp': '2024-01-01T00:00:10', 'blockchain_info': {'blocks': 101}, 'peer_info': [{}, {}, {}],
+        })
         
+        self.assertEqual(len(self.collector.metrics_data['test_node']), 2)
         summary = self.collector.get_metrics_summary('test_node')
         self.assertEqual(summary['total_snapshots'], 2)
+        self.assertEqual(summary['first_snapshot'], '2024-01-01T00:00:00')
+        self.assertEqual(summary['last_snapshot'], '2024-01-01T00:00:10')
         self.assertEqual(summary['initial_block_count'], 100)
         self.assertEqual(summary['final_block_count'], 101)
         self.assertEqual(summary['blocks_synced'], 1)
+        self.assertEqual(summary['avg_peer_count'], 2)
+        self.assertEqual(summary['max_peer_count'], 3)
+    
+    def test_summary_formats_timestamps(self):
+        """Test that the summary formats nanosecond collection times."""
+        self.collector._record_metrics('test_node', {
+            'timestamp_ns': 1_500_000_000, 'blockchain_info': {'blocks': 100}, 'peer_info': [],
+        })
+        self.collector._record_metrics('test_node', {
+            'timestamp_ns': 10_000_000_000, 'blockchain_info': {'blocks': 105}, 'peer_info': [],
+        })
+        
+        summary = self.collector.get_metrics_summary('test_node')
+        self.assertEqual(summary['first_snapshot'], '1970-01-01T00:00:01.500000+00:00')
+        self.assertEqual(summary['last_snapshot'], '1970-01-01T00:00:10+00:00')
+        self.assertEqual(summary['blocks_synced'], 5)
     
     def test_save_metrics_to_file(self):
         """Test saving metrics to file."""
         # Add some test data
         self.collector.metrics_data['test_node'] = [
             {'timestamp': '2024-01-01T00:00:00', 'blockchain_info': {'blocks': 100}},
+            {'timestamp_ns': 0, 'blockchain_info': {'blocks': 101}},
         ]
         
         output_file = Path(self.test_dir) / 'metrics.json'
@@ -62,8 +138,74 @@ class TestMetricsCollector(unittest.TestCase):
         self.assertTrue(output_file.exists())
         with open(output_file, 'r') as f:
             data = json.load(f)
-            self.assertEqual(len(data), 1)
+            self.assertEqual(len(data), 2)
             self.assertEqual(data[0]['blockchain_info']['blocks'], 100)
+            self.assertEqual(data[1]['timestamp'], '1970-01-01T00:00:00+00:00')
+    
+    def test_stream_metrics_to_file(self):
+        """Test that snapshots are streamed to an NDJSON file as collected."""
+        stream_file = Path(self.test_dir) / 'out' / 'metrics.ndjson'
+        self.collector.start_metrics_collection(
+            'test_node', str(Path(self.test_dir) / 'node'), interval=60, rpcport=1, output_file=str(stream_file)
+        )
+        
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not self.collector.metrics_data['test_node']:
+            time.sleep(0.01)
+        self.collector.stop_metrics_collection('test_node')
+        
+        data = self.collector.load_metrics_from_stream(str(stream_file))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['node_name'], 'test_node')
+        self.assertRegex(data[0]['timestamp'], r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{6})?\+00:00$')
+        self.assertNotIn('timestamp_ns', data[0])
+        self.assertEqual(len(stream_file.read_text().splitlines()), 1)
+    
+    def test_stream_write_error_drops_stream(self):
+        """Test that a failing stream write is logged and stops streaming for the node."""
+        stream = mock.Mock()
+        stream.write.side_effect = OSError(28, 'No space left on device')
+        collection = _NodeCollection('test_node', self.test_dir, 10, None, stream=stream)
+        
+        with mock.patch.object(self.collector.logger, 'error') as error:
+            self.collector._write_stream(collection, b'{}\n')
+        
+        error.assert_called_once()
+        stream.close.assert_called_once()
+        self.assertIsNone(collection.stream)
+    
+    def test_peer_info_polled_at_ratio(self):
+        """Test that getpeerinfo is only fetched every Nth poll and reused in between."""
+        collection = _NodeCollection('test_node', self.test_dir, 10, None, peer_info_ratio=3)
+        collection.rpc = FakeRPC()
+        
+        snapshots = [self.collector._collect_node_metrics(collection) for _ in range(4)]
+        
+        self.assertEqual(collection.rpc.calls.count('getblockchaininfo'), 4)
+        self.assertEqual(collection.rpc.calls.count('getpeerinfo'), 2)
+        self.assertEqual(collection.rpc.requests, 4)
+        self.assertTrue(all(len(m['peer_info']) == 1 for m in snapshots))
+    
+    def test_peer_info_dropped_after_failed_poll(self):
+        """Test that peers from an earlier poll are not reported with a failed poll."""
+        collection = _NodeCollection('test_node', self.test_dir, 10, None, peer_info_ratio=3)
+        collection.rpc = FakeRPC()
+        self.collector._collect_node_metrics(collection)
+        
+        collection.rpc.call = mock.Mock(side_effect=RuntimeError('node down'))
+        failed = self.collector._collect_node_metrics(collection)
+        self.assertNotIn('peer_info', failed)
+        self.assertIsNone(collection.peer_info)
+    
+    def test_batched_calls_fail_independently(self):
+        """Test that a failing getpeerinfo does not drop the blockchain info."""
+        collection = _NodeCollection('test_node', self.test_dir, 10, None)
+        collection.rpc = FakeRPC()
+        collection.rpc.failing.add('getpeerinfo')
+        
+        metrics = self.collector._collect_node_metrics(collection)
+        self.assertEqual(metrics['blockchain_info'], {'blocks': 1})
+        self.assertNotIn('peer_info', metrics)
     
     def test_get_metrics_summary_empty(self):
         """Test getting summary for node with no data."""
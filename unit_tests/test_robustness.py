@@ -0,0 +1,70 @@
+"""Unit tests for robustness library."""
+
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+import os
+
+# Add resources/lib to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'resources', 'lib'))
+import robustness
+from robustness import RobustnessLib
+from unit_tests.helpers import isolate_logging
+
+
+class TestStartVictimNode(unittest.TestCase):
+    """Test cases for starting the fault-injected victim node."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.pid_file = Path(self.test_dir) / "regtest" / "bitcoind.pid"
+        self.pid_file.parent.mkdir()
+
+        isolate_logging(self, Path(self.test_dir) / 'logs')
+        for patcher in (
+            mock.patch.object(robustness, '_VICTIM_STARTUP_WINDOW', 0.3),
+            mock.patch('robustness.subprocess.run', return_value=mock.Mock(returncode=0, stderr='')),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.lib = RobustnessLib()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _start(self):
+        """Make a single start attempt, without the retry decorator."""
+        RobustnessLib._start_victim_node.__wrapped__(
+            self.lib, 'bitcoind', self.test_dir, 18444, 18443, '127.0.0.1:18445', 0.005
+        )
+
+    def test_node_stays_running(self):
+        """Test that a node running for the whole startup window is accepted."""
+        self.pid_file.write_text(f"{os.getpid()}\n")
+
+        self._start()
+
+    def test_node_never_starts(self):
+        """Test that a node without a PID file fails within the startup window."""
+        with self.assertRaisesRegex(RuntimeError, "did not start"):
+            self._start()
+
+    def test_node_exits_during_startup_window(self):
+        """Test that a node exiting after writing its PID file is reported."""
+        self.pid_file.write_text(f"{os.getpid()}\n")
+
+        with (
+            mock.patch('robustness.is_process_running', side_effect=[True, False]),
+            self.assertRaisesRegex(RuntimeError, "exited shortly after start"),
+        ):
+            self._start()
+
+
+if __name__ == '__main__':
+    unittest.main()
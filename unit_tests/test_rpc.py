@@ -0,0 +1,140 @@
+"""Unit tests for the JSON-RPC client."""
+
+import unittest
+import tempfile
+import shutil
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from util.rpc import BitcoinRPC
+
+
+class FakeNodeHandler(BaseHTTPRequestHandler):
+    """Minimal JSON-RPC endpoint answering like a regtest node."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.server.requests.append((self.path, self.headers.get('Authorization')))
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+
+        if self.server.drop_next:
+            # Read the request but close the connection without answering
+            self.server.drop_next = False
+            self.close_connection = True
+            return
+
+        if isinstance(payload, list):
+            body = [self._respond(request) for request in payload]
+        else:
+            body = self._respond(payload)
+
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _respond(self, request):
+        if request['method'] == 'getblockcount':
+            return {'id': request['id'], 'result': 150, 'error': None}
+        if request['method'] == 'echo':
+            return {'id': request['id'], 'result': request['params'], 'error': None}
+        return {'id': request['id'], 'result': None, 'error': {'code': -32601, 'message': 'Method not found'}}
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestBitcoinRPC(unittest.TestCase):
+    """Test cases for BitcoinRPC class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        regtest_dir = Path(self.test_dir) / 'regtest'
+        regtest_dir.mkdir()
+        (regtest_dir / '.cookie').write_text('__cookie__:secret')
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeNodeHandler)
+        self.server.requests = []
+        self.server.drop_next = False
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self.server_thread.start()
+
+        self.rpc = BitcoinRPC(self.test_dir, rpcport=self.server.server_port)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.rpc.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_call(self):
+        """Test a single call authenticated with the cookie file."""
+        self.assertEqual(self.rpc.call('getblockcount'), 150)
+        self.assertEqual(self.server.requests, [('/', 'Basic X19jb29raWVfXzpzZWNyZXQ=')])
+
+    def test_wallet_call(self):
+        """Test that wallet calls are sent to the wallet endpoint."""
+        self.assertEqual(self.rpc.call('echo', [1, 'a'], wallet='miner'), [1, 'a'])
+        self.assertEqual(self.server.requests[0][0], '/wallet/miner')
+
+    def test_batch(self):
+        """Test that batched calls return results in request order."""
+        results = self.rpc.batch([('getblockcount', []), ('echo', ['x'])])
+        self.assertEqual(results, [150, ['x']])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_batch_errors_returned(self):
+        """Test that failed batched calls can be returned alongside the others."""
+        with self.assertRaises(RuntimeError):
+            self.rpc.batch([('getblockcount', []), ('nonexistent', [])])
+
+        results = self.rpc.batch([('getblockcount', []), ('nonexistent', [])], raise_errors=False)
+        self.assertEqual(results[0], 150)
+        self.assertIsInstance(results[1], RuntimeError)
+
+    def test_read_only_call_resent_after_dropped_connection(self):
+        """Test that a read-only call is resent when a reused connection drops."""
+        self.rpc.call('getblockcount')
+        self.server.drop_next = True
+
+        self.assertEqual(self.rpc.call('getblockcount'), 150)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_other_call_not_resent_after_dropped_connection(self):
+        """Test that a call the node may have executed is not sent twice."""
+        self.rpc.call('getblockcount')
+        self.server.drop_next = True
+
+        with self.assertRaises(RuntimeError):
+            self.rpc.call('sendtoaddress', ['bcrt1qaddress', 1])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_error_raises(self):
+        """Test that RPC errors raise RuntimeError."""
+        with self.assertRaises(RuntimeError):
+            self.rpc.call('nonexistent')
+
+    def test_connection_refused_raises(self):
+        """Test that an unreachable node raises RuntimeError."""
+        self.server.shutdown()
+        self.server.server_close()
+        rpc = BitcoinRPC(self.test_dir, rpcport=self.server.server_port, timeout=1)
+        with self.assertRaises(RuntimeError):
+            rpc.call('getblockcount')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Unit tests for test setup utilities."""
+
+import importlib.util
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from util import test_setup
+
+# The Robot library shares its module name with util.test_setup; load it by path
+_spec = importlib.util.spec_from_file_location(
+    'robot_test_setup', os.path.join(os.path.dirname(__file__), '..', 'resources', 'lib', 'test_setup.py')
+)
+robot_test_setup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(robot_test_setup)
+
+
+class TestResultsDirectory(unittest.TestCase):
+    """Test cases for results directory helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        patcher = mock.patch.multiple(test_setup, _RUN_TIMESTAMP=None, _RESULTS_DIR_CACHE={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_results_directory_is_stable(self):
+        """Test that repeated calls return the same directory."""
+        first = test_setup.setup_results_directory('suite')
+        second = test_setup.get_results_directory('suite')
+
+        self.assertEqual(first, second)
+        self.assertTrue(os.path.isdir(first))
+
+    def test_suites_share_run_timestamp(self):
+        """Test that all suites of a run land under one timestamp directory."""
+        first = test_setup.setup_results_directory('suite-a')
+        second = test_setup.setup_results_directory('suite-b')
+
+        self.assertEqual(os.path.dirname(first), os.path.dirname(second))
+        self.assertNotEqual(first, second)
+
+    def test_directory_created_once(self):
+        """Test that the directory is created on the first call only."""
+        first = test_setup.setup_results_directory('suite')
+        self.assertIsInstance(first, str)
+        self.assertTrue(os.path.isdir(first))
+
+        with mock.patch('util.test_setup.os.makedirs') as makedirs:
+            second = test_setup.setup_results_directory('suite')
+
+        self.assertEqual(first, second)
+        makedirs.assert_not_called()
+
+    def test_robot_keyword_returns_created_path(self):
+        """Test that the Robot library keyword creates the directory and returns a string."""
+        with mock.patch.dict(os.environ):
+            results_dir = robot_test_setup.TestSetup().setup_results_directory('suite')
+            self.assertEqual(os.environ['ROBOT_RESULTS_DIR'], results_dir)
+
+        self.assertIsInstance(results_dir, str)
+        self.assertTrue(os.path.isdir(results_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
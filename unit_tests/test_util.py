@@ -0,0 +1,126 @@
+"""Unit tests for util helpers."""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import util.util
+from util.util import is_process_running, json_dumps, json_loads, read_pid_file, tail_lines, wait_for_process
+
+
+class TestTailLines(unittest.TestCase):
+    """Test cases for tail_lines helper."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.log_file = Path(self.test_dir) / "debug.log"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_last_lines(self):
+        """Test that only the last N lines are returned."""
+        self.log_file.write_text("".join(f"line {i}\n" for i in range(1000)))
+
+        self.assertEqual(tail_lines(self.log_file, 3), "line 997\nline 998\nline 999\n")
+
+    def test_window_grows_for_long_lines(self):
+        """Test that lines longer than the initial window are read completely."""
+        long_line = "x" * 5000
+        self.log_file.write_text(f"first\n{long_line}\n{long_line}\n")
+
+        self.assertEqual(tail_lines(self.log_file, 2, bytes_per_line=10), f"{long_line}\n{long_line}\n")
+
+    def test_fewer_lines_than_requested(self):
+        """Test that the whole file is returned when it is shorter than N lines."""
+        self.log_file.write_text("a\nb")
+
+        self.assertEqual(tail_lines(self.log_file, 50), "a\nb")
+
+    def test_empty_file(self):
+        """Test that an empty file yields an empty string."""
+        self.log_file.write_text("")
+
+        self.assertEqual(tail_lines(self.log_file, 5), "")
+
+
+class TestPidFile(unittest.TestCase):
+    """Test cases for PID file helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.pid_file = Path(self.test_dir) / "bitcoind.pid"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_running_process(self):
+        """Test that the current process is reported as running."""
+        self.pid_file.write_text(f"{os.getpid()}\n")
+
+        self.assertEqual(read_pid_file(self.pid_file), os.getpid())
+        self.assertTrue(is_process_running(self.pid_file))
+
+    def test_rewritten_pid_file(self):
+        """Test that a PID file rewritten by a restarted node is re-read."""
+        self.pid_file.write_text("1234\n")
+        os.utime(self.pid_file, ns=(1_000_000_000, 1_000_000_000))
+        self.assertEqual(read_pid_file(self.pid_file), 1234)
+
+        self.pid_file.write_text("5678\n")
+        os.utime(self.pid_file, ns=(2_000_000_000, 2_000_000_000))
+        self.assertEqual(read_pid_file(self.pid_file), 5678)
+
+        self.pid_file.unlink()
+        self.assertIsNone(read_pid_file(self.pid_file))
+
+    def test_missing_pid_file(self):
+        """Test that a missing PID file means the process is not running."""
+        self.assertIsNone(read_pid_file(self.pid_file))
+        self.assertFalse(is_process_running(self.pid_file))
+
+    def test_invalid_pid_file(self):
+        """Test that a garbled PID file means the process is not running."""
+        self.pid_file.write_text("not a pid")
+
+        self.assertIsNone(read_pid_file(self.pid_file))
+        self.assertFalse(is_process_running(self.pid_file))
+
+
+    def test_wait_for_process(self):
+        """Test waiting for a PID file to name a running process."""
+        self.assertFalse(wait_for_process(self.pid_file, timeout=0.1))
+
+        self.pid_file.write_text(f"{os.getpid()}\n")
+        self.assertTrue(wait_for_process(self.pid_file, timeout=0))
+
+class TestJson(unittest.TestCase):
+    """Test cases for JSON helpers."""
+
+    def test_round_trip(self):
+        """Test that objects survive serialization with and without orjson."""
+        obj = {'blocks': 150, 'peers': [{'addr': '127.0.0.1:18444'}], 'ok': True, 'fee': None}
+        for codec in (util.util.orjson, None):
+            with self.subTest(orjson=codec is not None), mock.patch.object(util.util, 'orjson', codec):
+                data = json_dumps(obj)
+                self.assertIsInstance(data, bytes)
+                self.assertNotIn(b' ', data)
+                self.assertEqual(json_loads(data), obj)
+
+    def test_invalid_json_raises(self):
+        """Test that invalid JSON raises ValueError."""
+        with self.assertRaises(ValueError):
+            json_loads(b'<html>')
+
+if __name__ == '__main__':
+    unittest.main()